@@ -7,10 +7,16 @@ Usage examples:
   python scripts/metrics.py --sql-conn your-project:your-region:your-instance
 """
 import argparse
+from contextlib import contextmanager
+from itertools import chain, islice
+from operator import methodcaller
 
 import psycopg2
 
 DEFAULT_SQL_CONN = "your-project:your-region:your-instance"
+# Rows fetched per round-trip from the server-side cursor; the first chunk also
+# sizes the printed columns.
+FETCH_ITERSIZE = 1000
 
 
 def sql_connect(args):
@@ -19,25 +25,40 @@ def sql_connect(args):
     return psycopg2.connect(dbname="adsdb", user="postgres", host=f"/cloudsql/{args.sql_conn}")
 
 
-def run_query(con, sql):
-    with con.cursor() as cur:
+@contextmanager
+def run_query(con, sql, itersize=FETCH_ITERSIZE):
+    """Yield ``(cols, rows)`` with rows streamed from a server-side cursor."""
+
+    with con.cursor(name="metrics_stream") as cur:
+        cur.itersize = itersize
         cur.execute(sql)
+        # Named cursors only populate ``description`` after the first fetch.
+        head = cur.fetchmany(itersize)
         cols = [d[0] for d in cur.description]
-        rows = cur.fetchall()
-    return cols, rows
+        yield cols, chain(head, cur)
 
 
-def print_table(title, cols, rows):
+def print_table(title, cols, rows, sample=FETCH_ITERSIZE):
     print(f"\n== {title} ==")
-    if not rows:
+    rows = iter(rows)
+    str_rows = [tuple(map(str, r)) for r in islice(rows, sample)]
+    if not str_rows:
         print("(no rows)")
         return
-    widths = [max(len(str(c)), max((len(str(r[i])) for r in rows), default=0)) for i, c in enumerate(cols)]
-    fmt = "  " + " | ".join("{:<" + str(w) + "}" for w in widths)
-    print(fmt.format(*cols))
+    # Widths come from the first ``sample`` rows; later rows are printed as they
+    # arrive and may overflow their column.
+    widths = [max(map(len, col)) for col in zip(tuple(map(str, cols)), *str_rows)]
+    padders = [methodcaller("ljust", w) for w in widths]
+
+    def fmt(cells):
+        return "  " + " | ".join([pad(c) for pad, c in zip(padders, cells)])
+
+    print(fmt(map(str, cols)))
     print("  " + "-+-".join("-" * w for w in widths))
+    for r in str_rows:
+        print(fmt(r))
     for r in rows:
-        print(fmt.format(*[str(x) for x in r]))
+        print(fmt(map(str, r)))
 
 
 def main():
@@ -63,9 +84,12 @@ def main():
 
     for title, sql in sections:
         try:
-            cols, rows = run_query(con, sql)
-            print_table(title, cols, rows)
+            with run_query(con, sql) as (cols, rows):
+                print_table(title, cols, rows)
+            con.commit()
         except Exception as e:
+            # A failed query aborts the cursor's transaction; reset it for the next section.
+            con.rollback()
             print(f"\n== {title} ==\nERROR: {e}")
 
     con.close()
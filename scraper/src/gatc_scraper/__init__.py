@@ -1,7 +1,7 @@
 """High-level utilities shared across the GATC scrapers."""
 
-from .debug import dump_frame_html, dump_frame_inventory, ensure_debug_dir, ensure_debug_html
-from .hashing import normalize_and_hash, stable_int_hash
+from .debug import dump_frame_html, dump_frame_inventory, ensure_debug_dir, ensure_debug_html, install_frame_inventory
+from .hashing import normalize_and_hash, normalize_and_hash_async, png_dimensions, stable_int_hash
 from .logging import adlog, jlog
 from .metadata import build_gcs_metadata
 from .playwright import CHROMIUM_LAUNCH_ARGS, cleanup_playwright, element_is_visibly_displayed, wait_assets_ready, wait_policy_or_errors
@@ -20,11 +20,14 @@ __all__ = [
     "ensure_debug_dir",
     "ensure_debug_html",
     "get_scraper_version",
+    "install_frame_inventory",
     "GATC_URL_RE",
     "jlog",
     "normalize_and_hash",
+    "normalize_and_hash_async",
     "normalize_click_url",
     "parse_ids_from_url",
+    "png_dimensions",
     "select_primary_click_url",
     "stable_int_hash",
     "upload_png_image",
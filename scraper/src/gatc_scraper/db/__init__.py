@@ -1,7 +1,12 @@
 """Database helpers for the scraper pipelines."""
 
 from .postgres import (
+    DbWriter,
+    DbWriterFailed,
+    checkout,
+    connection_pool,
     ensure_asset_row,
+    finalize_ad,
     link_asset_success,
     persist_click_url,
     record_error,
@@ -11,7 +16,12 @@ from .postgres import (
 )
 
 __all__ = [
+    "DbWriter",
+    "DbWriterFailed",
+    "checkout",
+    "connection_pool",
     "ensure_asset_row",
+    "finalize_ad",
     "link_asset_success",
     "persist_click_url",
     "record_error",
@@ -2,21 +2,85 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
-import re
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import Optional
+from itertools import groupby
+from typing import Any, Awaitable, Callable, Optional, TypeVar
 
 import psycopg2
+from psycopg2.extras import execute_batch
+from psycopg2.pool import ThreadedConnectionPool
 
 from ..logging import jlog
 
 UTC = getattr(datetime, "UTC", timezone.utc)
 
+DB_BATCH_SIZE = int(os.getenv("DB_BATCH_SIZE", "500"))
+DB_FLUSH_INTERVAL_S = float(os.getenv("DB_FLUSH_INTERVAL_S", "1.0"))
+DB_POOL_MIN = 2
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "4"))
+EXECUTE_BATCH_PAGE_SIZE = 200
+DB_RECONNECT_ATTEMPTS = max(1, int(os.getenv("DB_RECONNECT_ATTEMPTS", "5")))
+
+_HEX_DIGITS = frozenset("0123456789abcdef")
+
+OnCommit = Optional[Callable[[], None]]
+Statement = tuple[str, tuple[Any, ...], OnCommit]
+T = TypeVar("T")
+
+# Statement templates are module constants so every call (and every DbWriter
+# execute_batch group) shares one string object per template.
+_SQL_UPSERT_PENDING = """
+INSERT INTO ads(ad_id, variant_id, ad_type, advertiser_id, status, scraper_version, source_url)
+VALUES (%s, %s, %s, %s, 'pending', %s, %s)
+ON CONFLICT (ad_id, variant_id) DO UPDATE
+   SET advertiser_id   = EXCLUDED.advertiser_id,
+       scraper_version = EXCLUDED.scraper_version,
+       source_url      = COALESCE(EXCLUDED.source_url, ads.source_url),
+       updated_at      = NOW()
+"""
+_SQL_LINK_ASSET_SUCCESS = """
+UPDATE ads
+   SET render_method   = %s,
+       width_px        = %s,
+       height_px       = %s,
+       file_bytes      = %s,
+       gcs_path        = %s,
+       asset_id        = %s,
+       capture_method  = %s,
+       capture_target  = %s,
+       ocr_text        = COALESCE(%s, ocr_text),
+       ocr_language    = COALESCE(%s, ocr_language),
+       ocr_confidence  = COALESCE(%s, ocr_confidence),
+       click_url       = COALESCE(%s, click_url),
+       status          = 'done',
+       scraped_at      = %s,
+       scraper_version = %s,
+       updated_at      = NOW()
+ WHERE ad_id = %s AND variant_id = %s
+"""
+_SQL_RECORD_STATUS = """
+UPDATE ads
+   SET status=%s,
+       last_error=%s,
+       updated_at=NOW()
+ WHERE ad_id=%s AND variant_id=%s
+"""
+_SQL_PERSIST_CLICK_URL = "UPDATE ads SET click_url=%s, updated_at=NOW() WHERE ad_id=%s AND variant_id=%s"
+_SQL_ENSURE_ASSET_ROW = """
+INSERT INTO assets(asset_id, sha256, phash, width_px, height_px, file_bytes, gcs_path)
+VALUES (%s, %s, %s, %s, %s, %s, %s)
+ON CONFLICT (asset_id) DO NOTHING
+"""
 
-def sql_connect(sql_conn: str, db_host: str | None = None, db_port: int | None = None):
-    """Return a psycopg2 connection using either TCP or a Cloud SQL socket."""
 
+def _connect_kwargs(sql_conn: str, db_host: str | None = None, db_port: int | None = None) -> dict[str, Any]:
     dbname = os.getenv("DB_NAME", "adsdb")
     user = os.getenv("DB_USER", "postgres")
     password = os.getenv("DB_PASSWORD")
@@ -24,7 +88,7 @@ def sql_connect(sql_conn: str, db_host: str | None = None, db_port: int | None =
         raise RuntimeError("DB_PASSWORD environment variable is required for database connections")
 
     if db_host:
-        return psycopg2.connect(
+        return dict(
             host=db_host,
             port=db_port or 5432,
             dbname=dbname,
@@ -38,7 +102,7 @@ def sql_connect(sql_conn: str, db_host: str | None = None, db_port: int | None =
         raise RuntimeError("sql_conn must be provided when db_host is not set")
     socket_dir = "/cloudsql"
     host = f"{socket_dir}/{sql_conn}"
-    return psycopg2.connect(
+    return dict(
         host=host,
         dbname=dbname,
         user=user,
@@ -47,6 +111,289 @@ def sql_connect(sql_conn: str, db_host: str | None = None, db_port: int | None =
     )
 
 
+def sql_connect(sql_conn: str, db_host: str | None = None, db_port: int | None = None):
+    """Return a psycopg2 connection using either TCP or a Cloud SQL socket."""
+
+    return psycopg2.connect(**_connect_kwargs(sql_conn, db_host, db_port))
+
+
+_POOLS: dict[tuple[tuple[str, Any], ...], ThreadedConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def connection_pool(
+    sql_conn: str,
+    db_host: str | None = None,
+    db_port: int | None = None,
+    *,
+    minconn: int = DB_POOL_MIN,
+    maxconn: int = DB_POOL_MAX,
+) -> ThreadedConnectionPool:
+    """Return the process-wide pool for these connection parameters, creating it on first use.
+
+    ``minconn``/``maxconn`` only apply when the pool is created.
+    """
+
+    kwargs = _connect_kwargs(sql_conn, db_host, db_port)
+    key = tuple(sorted(kwargs.items()))
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None or pool.closed:
+            pool = ThreadedConnectionPool(minconn, max(minconn, maxconn), **kwargs)
+            _POOLS[key] = pool
+    return pool
+
+
+@contextmanager
+def checkout(
+    sql_conn: str,
+    db_host: str | None = None,
+    db_port: int | None = None,
+    *,
+    maxconn: int = DB_POOL_MAX,
+) -> Iterator[Any]:
+    """Borrow a pooled connection for the duration of the ``with`` block."""
+
+    pool = connection_pool(sql_conn, db_host, db_port, maxconn=maxconn)
+    con = pool.getconn()
+    try:
+        yield con
+    finally:
+        pool.putconn(con)
+
+
+class DbWriter:
+    """Queue write statements and commit them in batched transactions.
+
+    Every helper in this module accepts a ``DbWriter`` wherever it accepts a
+    connection. Statements are kept in FIFO order (``ads`` rows reference
+    ``assets`` rows, so ordering matters); consecutive statements that share a
+    template are sent with ``execute_batch`` and each flush commits once.
+    Log lines that used to follow each ``commit()`` run as post-commit callbacks.
+
+    If the connection drops, the uncommitted statements go back to the front of
+    the queue and ``connect`` opens a replacement; when that keeps failing the
+    flush loop raises and :meth:`watch` ends the run. :meth:`finish` shuts the
+    writer down and flushes what is left.
+    """
+
+    def __init__(
+        self,
+        con,
+        *,
+        connect: Optional[Callable[[], Any]] = None,
+        batch_size: int = DB_BATCH_SIZE,
+        flush_interval_s: float = DB_FLUSH_INTERVAL_S,
+    ) -> None:
+        self.con = con
+        self.connect = connect
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_s = flush_interval_s
+        self._pending: deque[Statement] = deque()
+        self._stop = asyncio.Event()
+        self._failed = asyncio.Event()
+        self._owns_con = False
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def submit(self, sql: str, params: tuple[Any, ...], on_commit: OnCommit = None) -> None:
+        self._pending.append((sql, params, on_commit))
+
+    def submit_many(self, statements: list[Statement]) -> None:
+        self._pending.extend(statements)
+
+    def flush(self) -> int:
+        """Commit up to ``batch_size`` queued statements and return how many were taken."""
+
+        batch: list[Statement] = []
+        while self._pending and len(batch) < self.batch_size:
+            batch.append(self._pending.popleft())
+        if not batch:
+            return 0
+        try:
+            with self.con:
+                with self.con.cursor() as cur:
+                    for sql, run in groupby(batch, key=lambda item: item[0]):
+                        execute_batch(cur, sql, [params for _, params, _ in run], page_size=EXECUTE_BATCH_PAGE_SIZE)
+        except psycopg2.Error as exc:
+            if self._connection_lost(exc):
+                self._requeue(batch, exc)
+                return len(batch)
+            jlog("error", event="db_batch_error", rows=len(batch), error=str(exc))
+            self._replay(batch)
+            return len(batch)
+        _run_callbacks(batch)
+        return len(batch)
+
+    def _replay(self, batch: list[Statement]) -> None:
+        """Retry a failed batch one statement at a time so a bad row does not drop its neighbours."""
+
+        for i, (sql, params, on_commit) in enumerate(batch):
+            try:
+                with self.con:
+                    with self.con.cursor() as cur:
+                        cur.execute(sql, params)
+            except psycopg2.Error as exc:
+                if self._connection_lost(exc):
+                    self._requeue(batch[i:], exc)
+                    return
+                jlog("error", event="db_write_error", error=str(exc))
+                continue
+            _run_callbacks(((sql, params, on_commit),))
+
+    def _connection_lost(self, exc: psycopg2.Error) -> bool:
+        return isinstance(exc, (psycopg2.OperationalError, psycopg2.InterfaceError)) and bool(self.con.closed)
+
+    def _requeue(self, statements: list[Statement], exc: psycopg2.Error) -> None:
+        """Put uncommitted ``statements`` back at the head of the queue and reconnect."""
+
+        self._pending.extendleft(reversed(statements))
+        jlog("warning", event="db_connection_lost", requeued=len(statements), error=str(exc))
+        if self.connect is None:
+            raise exc
+        for attempt in range(1, DB_RECONNECT_ATTEMPTS + 1):
+            try:
+                con = self.connect()
+            except psycopg2.Error as reconnect_exc:
+                jlog("warning", event="db_reconnect_failed", attempt=attempt, error=str(reconnect_exc))
+                if attempt == DB_RECONNECT_ATTEMPTS:
+                    raise
+                time.sleep(min(2**attempt, 30))
+                continue
+            self._close_owned()
+            self.con = con
+            self._owns_con = True
+            jlog("info", event="db_reconnected", attempt=attempt)
+            return
+
+    def _close_owned(self) -> None:
+        if self._owns_con:
+            try:
+                self.con.close()
+            except psycopg2.Error:
+                pass
+            self._owns_con = False
+
+    def drain(self) -> None:
+        """Flush until the queue is empty."""
+
+        while self.flush():
+            pass
+
+    async def run(self) -> None:
+        """Drain the queue on a worker thread every ``flush_interval_s`` seconds until :meth:`stop`.
+
+        Flushing off the event loop keeps DB round-trips from stalling Playwright work;
+        the writer should therefore own its connection rather than share the reader's.
+        A final drain runs after :meth:`stop` so awaiting this task flushes everything.
+        """
+
+        try:
+            while not self._stop.is_set():
+                try:
+                    await asyncio.wait_for(self._stop.wait(), timeout=self.flush_interval_s)
+                except asyncio.TimeoutError:
+                    pass
+                await asyncio.to_thread(self.drain)
+        except Exception as exc:
+            jlog("error", event="db_writer_failed", queued=len(self._pending), error=str(exc))
+            self._failed.set()
+            raise
+
+    async def finish(self, flusher: asyncio.Task[None]) -> None:
+        """Stop the :meth:`run` task ``flusher`` and write out everything still queued.
+
+        Call this on every exit path, before the connection goes back to the pool. If
+        the flush loop already died (it logged ``db_writer_failed``), the queue gets one
+        more drain here; statements that still cannot be written raise.
+        """
+
+        self.stop()
+        try:
+            await flusher
+        except Exception:
+            pass
+        try:
+            if self._pending:
+                await asyncio.to_thread(self.drain)
+        finally:
+            self._close_owned()
+
+    async def watch(self, aw: Awaitable[T]) -> T:
+        """Await ``aw``, cancelling it and raising :class:`DbWriterFailed` if :meth:`run` dies first."""
+
+        task = asyncio.ensure_future(aw)
+        failed = asyncio.create_task(self._failed.wait())
+        try:
+            await asyncio.wait({task, failed}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            failed.cancel()
+        if not task.done():
+            task.cancel()
+            raise DbWriterFailed(f"DB writer stopped with {len(self._pending)} statements unwritten")
+        return task.result()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+class DbWriterFailed(RuntimeError):
+    """Raised by :meth:`DbWriter.watch` when the writer can no longer reach the database."""
+
+
+def _run_callbacks(statements) -> None:
+    """Run post-commit callbacks; a failing log line must not stop the flush loop."""
+
+    for _, _, on_commit in statements:
+        if on_commit is None:
+            continue
+        try:
+            on_commit()
+        except Exception as exc:
+            jlog("error", event="db_on_commit_error", error=str(exc))
+
+
+class _Pipeline:
+    """Collect statements from the helpers and send them to the database together.
+
+    On a plain connection the statements go out as one multi-statement query (one
+    round-trip, one commit); on a :class:`DbWriter` they are queued back-to-back.
+    """
+
+    def __init__(self) -> None:
+        self.statements: list[Statement] = []
+
+    def submit(self, sql: str, params: tuple[Any, ...], on_commit: OnCommit = None) -> None:
+        self.statements.append((sql, params, on_commit))
+
+    def send(self, con) -> None:
+        if not self.statements:
+            return
+        if isinstance(con, DbWriter):
+            con.submit_many(self.statements)
+            return
+        with con.cursor() as cur:
+            cur.execute(b";".join(cur.mogrify(sql, params) for sql, params, _ in self.statements))
+        con.commit()
+        for _, _, on_commit in self.statements:
+            if on_commit is not None:
+                on_commit()
+
+
+def _submit(con, sql: str, params: tuple[Any, ...], on_commit: OnCommit = None) -> None:
+    """Queue ``sql`` on a :class:`DbWriter`, or execute and commit it on a plain connection."""
+
+    if isinstance(con, (DbWriter, _Pipeline)):
+        con.submit(sql, params, on_commit)
+        return
+    with con.cursor() as cur:
+        cur.execute(sql, params)
+    con.commit()
+    if on_commit is not None:
+        on_commit()
+
+
 def upsert_pending(
     con,
     *,
@@ -70,20 +417,11 @@ def upsert_pending(
             variant_id=variant_id,
         )
         return
-    with con.cursor() as cur:
-        cur.execute(
-            """
-            INSERT INTO ads(ad_id, variant_id, ad_type, advertiser_id, status, scraper_version, source_url)
-            VALUES (%s, %s, %s, %s, 'pending', %s, %s)
-            ON CONFLICT (ad_id, variant_id) DO UPDATE
-               SET advertiser_id   = EXCLUDED.advertiser_id,
-                   scraper_version = EXCLUDED.scraper_version,
-                   source_url      = COALESCE(EXCLUDED.source_url, ads.source_url),
-                   updated_at      = NOW()
-            """,
-            (ad_id, variant_id, ad_type, advertiser_id, scraper_version, source_url),
-        )
-    con.commit()
+    _submit(
+        con,
+        _SQL_UPSERT_PENDING,
+        (ad_id, variant_id, ad_type, advertiser_id, scraper_version, source_url),
+    )
 
 
 def link_asset_success(
@@ -125,73 +463,57 @@ def link_asset_success(
         )
         return
     assert asset_id and isinstance(asset_id, str), "asset_id required"
-    assert re.fullmatch(r"[0-9a-f]{64}", asset_id), "asset_id must be 64-char lowercase hex (sha256)"
+    assert len(asset_id) == 64 and _HEX_DIGITS.issuperset(asset_id), "asset_id must be 64-char lowercase hex (sha256)"
     assert isinstance(width_px, int) and width_px > 0, "width_px must be > 0"
     assert isinstance(height_px, int) and height_px > 0, "height_px must be > 0"
     assert isinstance(file_bytes, int) and file_bytes > 0, "file_bytes must be > 0"
     assert gcs_path and gcs_path.startswith("gs://"), "gcs_path must be a gs:// path"
     assert render_method, "render_method required"
     assert capture_method, "capture_method required"
-    with con.cursor() as cur:
-        cur.execute(
-            """
-            UPDATE ads
-                SET render_method   = %s,
-                    width_px        = %s,
-                    height_px       = %s,
-                    file_bytes      = %s,
-                    gcs_path        = %s,
-                    asset_id        = %s,
-                    capture_method  = %s,
-                    capture_target  = %s,
-                    ocr_text        = COALESCE(%s, ocr_text),
-                    ocr_language    = COALESCE(%s, ocr_language),
-                    ocr_confidence  = COALESCE(%s, ocr_confidence),
-                    click_url       = COALESCE(%s, click_url),
-                    status          = 'done',
-                    scraped_at      = %s,
-                    scraper_version = %s,
-                    updated_at      = NOW()
-            WHERE ad_id = %s AND variant_id = %s
-            """,
-            (
-                render_method,
-                width_px,
-                height_px,
-                file_bytes,
-                gcs_path,
-                asset_id,
-                capture_method,
-                capture_target,
-                ocr_text,
-                ocr_language,
-                ocr_confidence,
-                click_url,
-                scraped_at or datetime.now(UTC),
-                scraper_version,
-                ad_id,
-                variant_id,
-            ),
+
+    def _log_done() -> None:
+        jlog(
+            "info",
+            event="ad_done",
+            ad_type=ad_type,
+            advertiser_id=advertiser_id,
+            ad_id=ad_id,
+            variant_id=variant_id,
+            width=width_px,
+            height=height_px,
+            bytes=file_bytes,
+            asset_id=asset_id,
+            gcs_path=gcs_path,
+            render_method=render_method,
+            capture_method=capture_method,
+            capture_target=capture_target,
+            ocr_chars=len(ocr_text) if ocr_text else 0,
+            ocr_language=ocr_language,
+            ocr_confidence=ocr_confidence,
         )
-    con.commit()
-    jlog(
-        "info",
-        event="ad_done",
-        ad_type=ad_type,
-        advertiser_id=advertiser_id,
-        ad_id=ad_id,
-        variant_id=variant_id,
-        width=width_px,
-        height=height_px,
-        bytes=file_bytes,
-        asset_id=asset_id,
-        gcs_path=gcs_path,
-        render_method=render_method,
-        capture_method=capture_method,
-        capture_target=capture_target,
-        ocr_chars=len(ocr_text) if ocr_text else 0,
-        ocr_language=ocr_language,
-        ocr_confidence=ocr_confidence,
+
+    _submit(
+        con,
+        _SQL_LINK_ASSET_SUCCESS,
+        (
+            render_method,
+            width_px,
+            height_px,
+            file_bytes,
+            gcs_path,
+            asset_id,
+            capture_method,
+            capture_target,
+            ocr_text,
+            ocr_language,
+            ocr_confidence,
+            click_url,
+            scraped_at or datetime.now(UTC),
+            scraper_version,
+            ad_id,
+            variant_id,
+        ),
+        _log_done,
     )
 
 
@@ -218,22 +540,19 @@ def record_status(
             last_error=last_error,
         )
         return
-    with con.cursor() as cur:
-        cur.execute(
-            """
-            UPDATE ads
-               SET status=%s,
-                   last_error=%s,
-                   updated_at=NOW()
-             WHERE ad_id=%s AND variant_id=%s
-            """,
-            (status, last_error, ad_id, variant_id),
-        )
-    con.commit()
-    if status in ("removed_for_policy_violation", "rate_limited_429", "not_found", "variation_unavailable"):
-        jlog("info", event="ad_terminal", advertiser_id=advertiser_id, ad_id=ad_id, variant_id=variant_id, status=status)
-    elif status == "error":
-        jlog("error", event="ad_error", advertiser_id=advertiser_id, ad_id=ad_id, variant_id=variant_id, error=last_error or "")
+
+    def _log_status() -> None:
+        if status in ("removed_for_policy_violation", "rate_limited_429", "not_found", "variation_unavailable"):
+            jlog("info", event="ad_terminal", advertiser_id=advertiser_id, ad_id=ad_id, variant_id=variant_id, status=status)
+        elif status == "error":
+            jlog("error", event="ad_error", advertiser_id=advertiser_id, ad_id=ad_id, variant_id=variant_id, error=last_error or "")
+
+    _submit(
+        con,
+        _SQL_RECORD_STATUS,
+        (status, last_error, ad_id, variant_id),
+        _log_status,
+    )
 
 
 def record_error(
@@ -281,13 +600,12 @@ def persist_click_url(
             click_url=click_url,
         )
         return
-    with con.cursor() as cur:
-        cur.execute(
-            "UPDATE ads SET click_url=%s, updated_at=NOW() WHERE ad_id=%s AND variant_id=%s",
-            (click_url, ad_id, variant_id),
-        )
-    con.commit()
-    jlog("info", event="click_url_saved", advertiser_id=advertiser_id, ad_id=ad_id, variant_id=variant_id, click_url=click_url)
+    _submit(
+        con,
+        _SQL_PERSIST_CLICK_URL,
+        (click_url, ad_id, variant_id),
+        lambda: jlog("info", event="click_url_saved", advertiser_id=advertiser_id, ad_id=ad_id, variant_id=variant_id, click_url=click_url),
+    )
 
 
 def ensure_asset_row(
@@ -305,20 +623,83 @@ def ensure_asset_row(
 
     if dry_run:
         return
-    with con.cursor() as cur:
-        cur.execute(
-            """
-            INSERT INTO assets(asset_id, sha256, phash, width_px, height_px, file_bytes, gcs_path)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (asset_id) DO NOTHING
-            """,
-            (asset_id, asset_id, phash, width_px, height_px, file_bytes, gcs_path),
-        )
-    con.commit()
+    _submit(
+        con,
+        _SQL_ENSURE_ASSET_ROW,
+        (asset_id, asset_id, phash, width_px, height_px, file_bytes, gcs_path),
+    )
+
+
+def finalize_ad(
+    con,
+    *,
+    ad_type: str,
+    advertiser_id: str,
+    ad_id: str,
+    variant_id: str,
+    asset_id: str,
+    render_method: str,
+    width_px: int,
+    height_px: int,
+    file_bytes: int,
+    phash: str,
+    gcs_path: str,
+    capture_method: Optional[str] = None,
+    capture_target: Optional[str] = None,
+    scraper_version: Optional[str] = None,
+    scraped_at: Optional[datetime] = None,
+    click_url: Optional[str] = None,
+    ocr_text: Optional[str] = None,
+    ocr_language: Optional[str] = None,
+    ocr_confidence: Optional[float] = None,
+    dry_run: bool = False,
+) -> None:
+    """Run :func:`ensure_asset_row` and :func:`link_asset_success` as a single round-trip."""
+
+    pipe = _Pipeline()
+    ensure_asset_row(
+        pipe,
+        asset_id=asset_id,
+        phash=phash,
+        width_px=width_px,
+        height_px=height_px,
+        file_bytes=file_bytes,
+        gcs_path=gcs_path,
+        dry_run=dry_run,
+    )
+    link_asset_success(
+        pipe,
+        ad_type=ad_type,
+        advertiser_id=advertiser_id,
+        ad_id=ad_id,
+        variant_id=variant_id,
+        asset_id=asset_id,
+        render_method=render_method,
+        width_px=width_px,
+        height_px=height_px,
+        file_bytes=file_bytes,
+        phash=phash,
+        gcs_path=gcs_path,
+        capture_method=capture_method,
+        capture_target=capture_target,
+        scraper_version=scraper_version,
+        scraped_at=scraped_at,
+        click_url=click_url,
+        ocr_text=ocr_text,
+        ocr_language=ocr_language,
+        ocr_confidence=ocr_confidence,
+        dry_run=dry_run,
+    )
+    pipe.send(con)
 
 
 __all__ = [
+    "DbWriter",
+    "DbWriterFailed",
+    "checkout",
+    "connection_pool",
     "ensure_asset_row",
+    "finalize_ad",
     "link_asset_success",
     "persist_click_url",
     "record_error",
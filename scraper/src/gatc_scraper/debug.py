@@ -2,14 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
+import tempfile
 from typing import Any
 
-from playwright.async_api import Page
+from playwright.async_api import BrowserContext, Page
 
 from .logging import jlog
 
 DEBUG_DIR = "media/debug"
+# Caps concurrent debug-file writers so many workers dumping at once do not
+# saturate the thread pool used by asyncio.to_thread.
+_WRITE_SLOTS = asyncio.Semaphore(4)
 
 
 def ensure_debug_dir() -> str:
@@ -22,14 +27,34 @@ def ensure_debug_dir() -> str:
     return DEBUG_DIR
 
 
+def _write_text_atomic(path: str, text: str) -> None:
+    """Write ``text`` to a temp file beside ``path`` and rename it into place."""
+
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".tmp-", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+async def _write_debug_file(filename: str, text: str) -> None:
+    async with _WRITE_SLOTS:
+        await asyncio.to_thread(_write_text_atomic, os.path.join(DEBUG_DIR, filename), text)
+
+
 async def ensure_debug_html(page: Page, ad_id: str) -> None:
     """Persist the current page HTML for later debugging (best effort)."""
 
     try:
         ensure_debug_dir()
         html = await page.content()
-        with open(os.path.join(DEBUG_DIR, f"page_{ad_id}.html"), "w", encoding="utf-8") as f:
-            f.write(html)
+        await _write_debug_file(f"page_{ad_id}.html", html)
     except Exception as exc:  # pragma: no cover - logging only
         jlog("error", event="debug_save_html_error", ad_id=ad_id, error=str(exc))
 
@@ -40,41 +65,57 @@ async def dump_frame_html(frame, filename: str) -> None:
     try:
         ensure_debug_dir()
         html = await frame.evaluate("() => document.documentElement.outerHTML")
-        with open(os.path.join(DEBUG_DIR, filename), "w", encoding="utf-8") as fh:
-            fh.write(html)
+        await _write_debug_file(filename, html)
     except Exception as exc:  # pragma: no cover - logging only
         jlog("error", event="debug_save_iframe_html_error", filename=filename, error=str(exc))
 
 
+_FRAME_INVENTORY_FN = """
+() => {
+  const out = [];
+  const iframes = Array.from(document.querySelectorAll('iframe'));
+  for (const fr of iframes) {
+    const id = fr.id || '';
+    const src = fr.getAttribute('src') || '';
+    const w = Number(fr.getAttribute('width')) || fr.clientWidth || 0;
+    const h = Number(fr.getAttribute('height')) || fr.clientHeight || 0;
+    const rect = fr.getBoundingClientRect();
+    out.push({ id, src, w, h, rect: { x: rect.x, y: rect.y, width: rect.width, height: rect.height } });
+  }
+  return out;
+}
+""".strip()
+
+# Installed once per browser context so each inventory call only sends a short
+# call expression over CDP instead of the whole function body.
+FRAME_INVENTORY_INIT_JS = f"window.__gatcInventory = {_FRAME_INVENTORY_FN};"
+
+
+async def install_frame_inventory(context: BrowserContext) -> None:
+    """Register ``window.__gatcInventory`` on every page opened in ``context``."""
+
+    await context.add_init_script(FRAME_INVENTORY_INIT_JS)
+
+
 async def dump_frame_inventory(page: Page) -> list[dict[str, Any]]:
     """Return a structured list describing all iframes on the page."""
 
     try:
-        return await page.evaluate(
-            """
-            () => {
-              const out = [];
-              const iframes = Array.from(document.querySelectorAll('iframe'));
-              for (const fr of iframes) {
-                const id = fr.id || '';
-                const src = fr.getAttribute('src') || '';
-                const w = Number(fr.getAttribute('width')) || fr.clientWidth || 0;
-                const h = Number(fr.getAttribute('height')) || fr.clientHeight || 0;
-                const rect = fr.getBoundingClientRect();
-                out.push({ id, src, w, h, rect: { x: rect.x, y: rect.y, width: rect.width, height: rect.height } });
-              }
-              return out;
-            }
-            """
-        )
+        frames = await page.evaluate("() => window.__gatcInventory ? window.__gatcInventory() : null")
+        if frames is None:
+            # Context was created without install_frame_inventory; ship the function inline.
+            frames = await page.evaluate(_FRAME_INVENTORY_FN)
+        return frames
     except Exception:
         return []
 
 
 __all__ = [
     "DEBUG_DIR",
+    "FRAME_INVENTORY_INIT_JS",
     "dump_frame_html",
     "dump_frame_inventory",
     "ensure_debug_dir",
     "ensure_debug_html",
+    "install_frame_inventory",
 ]
@@ -2,10 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
+import multiprocessing
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from io import BytesIO
 from typing import TYPE_CHECKING, Any, Literal, Union, cast
 
+import numpy as np
 from PIL import Image, ImageChops
 
 if TYPE_CHECKING:  # pragma: no cover - typing helper
@@ -16,6 +23,13 @@ else:  # Pillow < 10 compatibility where Resampling lives on Image
 
 LanczosType = Union["Resampling", Literal[0, 1, 2, 3, 4, 5]]
 
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Worker processes for normalize_and_hash_async; 0 means one per CPU, 1 runs inline.
+HASH_WORKERS = int(os.getenv("GATC_HASH_WORKERS", "0"))
+_HASH_POOL: ProcessPoolExecutor | None = None
+
 
 def _lanczos_filter() -> LanczosType:
     resampling: Any = getattr(Image, "Resampling", None)
@@ -27,13 +41,39 @@ def _lanczos_filter() -> LanczosType:
 def stable_int_hash(s: str) -> int:
     """Return a small deterministic hash for sharding purposes."""
 
-    return int(hashlib.sha1(s.encode("utf-8")).hexdigest()[:8], 16)
+    return int.from_bytes(hashlib.sha1(s.encode("utf-8")).digest()[:4], "big")
+
+
+def png_dimensions(data: bytes) -> tuple[int, int] | None:
+    """Return ``(width, height)`` from a PNG's IHDR chunk without decoding, or ``None`` if not a PNG."""
+
+    if len(data) < 24 or not data.startswith(_PNG_SIGNATURE) or data[12:16] != b"IHDR":
+        return None
+    width, height = struct.unpack(">II", data[16:24])
+    return width, height
+
+
+def _alpha_bbox(img: Image.Image) -> tuple[int, int, int, int] | None:
+    """Bounding box of pixels with alpha > 100, or ``None`` if there are none.
+
+    Same box as differencing against transparent white, thresholding at 100 and
+    calling ``getbbox`` (which only inspects alpha for RGBA), in one pass over the
+    alpha band.
+    """
+
+    mask = np.asarray(img.getchannel("A")) > 100
+    rows = np.flatnonzero(mask.any(axis=1))
+    if not rows.size:
+        return None
+    cols = np.flatnonzero(mask.any(axis=0))
+    return int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1
 
 
 def _trim_border(img: Image.Image) -> Image.Image:
     if img.mode == "RGBA":
-        bg = Image.new(img.mode, img.size, (255, 255, 255, 0))
-    elif img.mode == "LA":
+        bbox = _alpha_bbox(img)
+        return img.crop(bbox) if bbox else img
+    if img.mode == "LA":
         bg = Image.new(img.mode, img.size, (255, 0))
     elif img.mode == "L":
         bg = Image.new(img.mode, img.size, 255)
@@ -48,25 +88,60 @@ def _trim_border(img: Image.Image) -> Image.Image:
 def normalize_and_hash(png_bytes: bytes, *, trim: bool = True) -> tuple[bytes, str, str, int, int]:
     """Normalize a PNG payload and compute deterministic hashes."""
 
-    with Image.open(BytesIO(png_bytes)) as im:
-        im = im.convert("RGBA")
+    with Image.open(BytesIO(png_bytes)) as src:
+        # Opt-in: an RGBA PNG that trimming leaves untouched is already normalized
+        # enough, so skip the slow optimize=True re-encode and hash the source bytes.
+        # This changes asset_id for such inputs relative to the re-encoded form.
+        reuse = (
+            os.getenv("GATC_REUSE_SOURCE_PNG", "0").lower() in _TRUE_VALUES
+            and src.format == "PNG"
+            and src.mode == "RGBA"
+            and not getattr(src, "is_animated", False)
+        )
+        # convert() always copies, even to the same mode; only pay for it when needed.
+        im = src if src.mode == "RGBA" else src.convert("RGBA")
         if trim:
-            im = _trim_border(im)
+            trimmed = _trim_border(im)
+            reuse = reuse and trimmed.size == im.size
+            im = trimmed
         width, height = im.size
 
-        out = BytesIO()
-        im.save(out, format="PNG", optimize=True)
-        norm_png = out.getvalue()
+        if reuse:
+            norm_png = png_bytes
+        else:
+            out = BytesIO()
+            im.save(out, format="PNG", optimize=True)
+            norm_png = out.getvalue()
 
         sha = hashlib.sha256(norm_png).hexdigest()
 
         ah = im.convert("L").resize((8, 8), resample=_lanczos_filter())
-        pixels = list(ah.getdata())
-        avg = sum(pixels) / len(pixels)
-        bits = "".join("1" if p > avg else "0" for p in pixels)
-        phash = f"{int(bits, 2):016x}"
+        arr = np.frombuffer(ah.tobytes(), dtype=np.uint8)
+        avg = arr.mean()
+        phash = f"{int.from_bytes(np.packbits(arr > avg).tobytes(), 'big'):016x}"
 
         return norm_png, sha, phash, width, height
 
 
-__all__ = ["normalize_and_hash", "stable_int_hash"]
+def _hash_pool() -> ProcessPoolExecutor | None:
+    global _HASH_POOL
+    workers = HASH_WORKERS or (os.cpu_count() or 1)
+    if workers <= 1:
+        return None
+    if _HASH_POOL is None:
+        # spawn, not fork: the parent runs Playwright and DB threads that must not be cloned.
+        _HASH_POOL = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return _HASH_POOL
+
+
+async def normalize_and_hash_async(png_bytes: bytes, *, trim: bool = True) -> tuple[bytes, str, str, int, int]:
+    """Run ``normalize_and_hash`` in a worker process so capture workers are not serialized on the GIL."""
+
+    pool = _hash_pool()
+    if pool is None:
+        return normalize_and_hash(png_bytes, trim=trim)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pool, partial(normalize_and_hash, png_bytes, trim=trim))
+
+
+__all__ = ["normalize_and_hash", "normalize_and_hash_async", "png_dimensions", "stable_int_hash"]
@@ -69,14 +69,17 @@ import json
 import logging
 import os
 import re
+import sys
 import urllib.parse
-from collections.abc import Iterable
-from dataclasses import dataclass
-from datetime import date, datetime, timezone
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, fields
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
 from io import BytesIO
 from types import ModuleType
 from typing import TYPE_CHECKING, Any, cast
 
+import numpy as np
 from gatc_scraper import (
     CHROMIUM_LAUNCH_ARGS,
     adlog,
@@ -85,10 +88,12 @@ from gatc_scraper import (
     dump_frame_inventory,
     element_is_visibly_displayed,
     ensure_debug_html,
+    install_frame_inventory,
     jlog,
-    normalize_and_hash,
+    normalize_and_hash_async,
     normalize_click_url,
     parse_ids_from_url,
+    png_dimensions,
     select_primary_click_url,
     stable_int_hash,
     wait_assets_ready,
@@ -104,10 +109,12 @@ from gatc_scraper import (
     upload_png_image as upload_png,
 )
 from gatc_scraper.db import (
-    ensure_asset_row as db_ensure_asset_row,
+    DbWriter,
+    checkout,
+    sql_connect,
 )
 from gatc_scraper.db import (
-    link_asset_success as db_link_asset_success,
+    finalize_ad as db_finalize_ad,
 )
 from gatc_scraper.db import (
     persist_click_url as db_persist_click_url,
@@ -118,20 +125,18 @@ from gatc_scraper.db import (
 from gatc_scraper.db import (
     record_status as db_record_status,
 )
-from gatc_scraper.db import (
-    sql_connect,
-)
 from gatc_scraper.db import (
     upsert_pending as db_upsert_pending,
 )
 from gatc_scraper.ocr import OCRResult, extract_text_from_image, sanitize_ocr_text
-from google.cloud import bigquery, storage  # type: ignore[attr-defined]
 from PIL import Image
 from playwright.async_api import Error as PlaywrightError
 from playwright.async_api import Page, TimeoutError, async_playwright
 
 requests: Any
 if TYPE_CHECKING:
+    from google.cloud import bigquery, storage  # type: ignore[attr-defined]
+
     requests = cast(Any, ModuleType("requests"))
 else:
     requests = importlib.import_module("requests")
@@ -147,8 +152,38 @@ DEFAULT_GCS_BUCKET = "your-scraper-bucket"
 DEFAULT_PROJECT_ID = "your-gcp-project"
 DEFAULT_CONCURRENCY = 2
 DEFAULT_BATCH_SIZE = 5000
+PENDING_CHECK_BATCH = 500  # streamed BigQuery rows status-checked per DB round-trip
 DEFAULT_SQL_CONN = "your-project:your-region:your-instance"
+ORDER_BY_CHOICES = ("none", "date_asc", "date_desc", "advertiser")
+# Bare http(s) URLs embedded in creative metadata / inline scripts (click URL discovery).
+_HTTP_URL_RE = re.compile(r"https?://[^\s'\"]+")
+# Ad redirector URLs only (these wrap the destination in an adurl parameter).
+_SCRIPT_REDIRECT_URL_RE = re.compile(r"https?://(?:[\w-]+\.)*(?:googleadservices\.com|googleads\.g\.doubleclick\.net)/[^\s'\"]+")
+# Analytics/tag endpoints creatives load that never affect what they render; blocked on
+# creative pages. Fonts and media stay: they change the captured pixels.
+_TRACKER_URL_RE = re.compile(
+    r"^https?://(?:[\w-]+\.)*(?:google-analytics\.com|googletagmanager\.com|analytics\.google\.com|stats\.g\.doubleclick\.net)/"
+)
+# Path suffixes of iframe srcs that are bare image files rather than creative documents.
+_IMAGE_URL_SUFFIXES = (".png", ".jpg", ".jpeg", ".gif", ".webp")
+# Hosts that never carry a creative's destination (Google infra, ad redirectors, beacons).
+# One str.endswith(tuple) call beats both an if-chain and an end-anchored regex here.
+_NON_DESTINATION_HOSTS = (
+    "google.com",
+    "googleadservices.com",
+    "doubleclick.net",
+    "tpc.googlesyndication.com",
+    "pagead2.googlesyndication.com",
+)
+# Well-known FLETCH click anchors; spliced into every DOM probe below as a JS array literal.
+_FLETCH_ANCHOR_SELECTORS = ("#image-anchor", "#header", "#visurl")
+_FLETCH_ANCHORS_JS = json.dumps(list(_FLETCH_ANCHOR_SELECTORS))
 IMAGE_VARIANT_ID = "v1"  # primary variant identifier for IMAGE creatives
+# Skip PNG captures narrower/shorter than this (pre-trim, read from the IHDR header)
+# before paying for a full decode; 0 disables the check. The threshold applies to the
+# raw pixels of the capture: screenshots are taken at DEVICE_SCALE_FACTOR, fetched
+# images at their natural size, so a screenshot's CSS size is this value / scale.
+MIN_ASSET_DIM_PX = int(os.getenv("GATC_MIN_ASSET_PX", "0"))
 
 # Rendering / timeout defaults (overridable via CLI or env)
 DEFAULT_DEVICE_SCALE_FACTOR = int(os.getenv("DEVICE_SCALE_FACTOR", "3"))
@@ -161,6 +196,22 @@ DEFAULT_SETTLE_MIN_OBSERVE_MS = int(os.getenv("GATC_SETTLE_MIN_OBSERVE_MS", "600
 FLETCH_SETTLE_MAX_MS = int(os.getenv("GATC_FLETCH_SETTLE_MAX_MS", "1800"))
 FLETCH_SETTLE_MIN_STABLE_MS = int(os.getenv("GATC_FLETCH_SETTLE_MIN_MS", "600"))
 FLETCH_SETTLE_MIN_OBSERVE_MS = int(os.getenv("GATC_FLETCH_SETTLE_MIN_OBSERVE_MS", "400"))
+# Static creatives (no change since the first sample) stop settling after this many
+# min-stable windows instead of sampling until the max wait; 0 disables the fast exit.
+SETTLE_FAST_EXIT_FACTOR = int(os.getenv("GATC_SETTLE_FAST_EXIT_FACTOR", "3"))
+# Concurrent CDP screenshots across all pages in this process; more than a few thrash the browser.
+_SCREENSHOT_SLOTS = asyncio.Semaphore(int(os.getenv("GATC_SCREENSHOT_CONCURRENCY", "4")))
+# Iframe variant pages one ad renders at once under --all-variants (large carousels queue).
+IFRAME_VARIANT_CONCURRENCY = max(1, int(os.getenv("GATC_IFRAME_VARIANT_CONCURRENCY", "3")))
+HTTP_POOL_CONNECTIONS = 20  # distinct creative hosts kept warm by the shared HTTP adapter
+HTTP_POOL_MAXSIZE = 50  # keep-alive connections per host
+# Decode settle-loop frames on a worker thread so other pages keep the event loop; set 0 to hash inline.
+SETTLE_HASH_OFFLOAD = os.getenv("GATC_SETTLE_HASH_OFFLOAD", "1").lower() in {"1", "true", "yes", "on"}
+# Smallest container box the full-page sadbundle fallback will clip to; smaller boxes capture the whole page.
+FALLBACK_CLIP_MIN_PX = 10
+GATC_ORIGIN = "https://adstransparency.google.com"  # origin whose storage is cleared between reused-context ads
+# Ads served by one consumer's BrowserContext before it is recreated; 0 disables reuse.
+CONTEXT_REUSE_MAX_ADS = int(os.getenv("GATC_CONTEXT_REUSE_ADS", "50"))
 
 # Capture provenance constants
 CAPTURE_METHOD_IMG = "img"
@@ -184,7 +235,11 @@ def get_scraper_version() -> str:
 # ============================
 
 
-@dataclass(frozen=True)
+# Advertiser IDs to skip; checked once per streamed row, so keep membership O(1).
+SkipSet = frozenset[str]
+
+
+@dataclass(frozen=True, slots=True)
 class CliArgs:
     project_id: str
     gcs_bucket: str
@@ -199,7 +254,7 @@ class CliArgs:
     start_date: str | None
     end_date: str | None
     order_by: str
-    skip_advertisers: list[str]
+    skip_advertisers: SkipSet
     ad_id: str | None
     ad_url: str | None
     advertiser_id: str | None
@@ -223,16 +278,50 @@ class CliArgs:
 
 
 def _coerce_dates(args: argparse.Namespace) -> None:
-    if getattr(args, "since_days", None):
-        today = datetime.now(UTC).date()
-        args.start_date = date.fromordinal(today.toordinal() - args.since_days).isoformat()
-    if getattr(args, "limit", None) and not args.sql_limit:
+    # A bare year selects that calendar year: --start-date=2024 becomes 2024-01-01, and
+    # end_date defaults to 2024-12-31 (inclusive, like --end-date) unless given.
+    if args.start_date and len(args.start_date) == 4 and args.start_date.isdigit():
+        year = int(args.start_date)
+        args.start_date = f"{year:04d}-01-01"
+        args.end_date = args.end_date or f"{year:04d}-12-31"
+    if args.end_date and len(args.end_date) == 4 and args.end_date.isdigit():
+        args.end_date = f"{int(args.end_date):04d}-12-31"
+    if args.since_days:
+        args.start_date = (datetime.now(UTC).date() - timedelta(days=args.since_days)).isoformat()
+    if args.limit and not args.sql_limit:
         args.sql_limit = args.limit
 
 
+_WARNED_SCANS: set[tuple[object, ...]] = set()
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def _is_iso_date(value: str) -> bool:
+    # fromisoformat alone is too lenient on 3.11+ (accepts 20240101, 2024-W01-1).
+    if not _ISO_DATE_RE.fullmatch(value):
+        return False
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
 def validate_args(args: argparse.Namespace) -> None:
     """Emit warnings/errors for likely mistakes or expensive runs."""
-    # Start/end consistency
+    # Fail fast on malformed input, before any browser or cloud client starts.
+    for name in ("start_date", "end_date"):
+        value = getattr(args, name)
+        if value and not _is_iso_date(value):
+            raise ValueError(f"{name} must be YYYY-MM-DD, got {value!r}")
+    if args.since_days is not None and args.since_days < 0:
+        raise ValueError(f"since_days must be >= 0, got {args.since_days}")
+    if args.shard_count < 1 or not 0 <= args.shard < args.shard_count:
+        raise ValueError(f"shard must satisfy 0 <= shard < shard_count, got shard={args.shard} shard_count={args.shard_count}")
+    if args.concurrency < 1 or args.batch_size < 1:
+        raise ValueError(f"concurrency and batch_size must be >= 1, got {args.concurrency} and {args.batch_size}")
+
+    # Start/end consistency (both ISO dates at this point, so string order is date order)
     if args.start_date and args.end_date and args.start_date > args.end_date:
         raise ValueError(f"start_date ({args.start_date}) is after end_date ({args.end_date})")
 
@@ -240,6 +329,13 @@ def validate_args(args: argparse.Namespace) -> None:
     if args.ad_url or args.ad_id or args.manifest_path:
         return
 
+    # Scan warnings depend only on these inputs; emit them once per process per combination
+    # so repeated parse_args calls (tests, re-entrant CLIs) do not flood the logs.
+    key = (args.start_date, args.end_date, args.since_days, args.sql_limit, args.max_ads, args.shard, args.shard_count)
+    if key in _WARNED_SCANS:
+        return
+    _WARNED_SCANS.add(key)
+
     # Potential full‑table scans
     no_dates = not args.start_date and not args.since_days and not args.end_date
     no_limit = not args.sql_limit and not args.max_ads
@@ -257,7 +353,7 @@ def validate_args(args: argparse.Namespace) -> None:
             "warning",
             event="sharded_full_scan",
             message=(
-                "Sharding is enabled but no date/limit provided; each shard will read pages of the full dataset. "
+                "Sharding is enabled but no date/limit provided; each shard's query will scan the full table. "
                 "Add --since-days or --sql-limit unless you truly want a whole-table pass."
             ),
             shard=args.shard,
@@ -265,7 +361,21 @@ def validate_args(args: argparse.Namespace) -> None:
         )
 
 
-def parse_args() -> CliArgs:
+def _compute_cloud_run_shard() -> tuple[int, int] | None:
+    """Return ``(task_index, task_count)`` from the Cloud Run Job env, if both are set and numeric."""
+    task_index = os.getenv("CLOUD_RUN_TASK_INDEX") or ""
+    task_count = os.getenv("CLOUD_RUN_TASK_COUNT") or ""
+    if task_index.isdigit() and task_count.isdigit():
+        return int(task_index), int(task_count)
+    return None
+
+
+# The task env is fixed for the life of the process, so read it once at import.
+_CLOUD_RUN_SHARD = _compute_cloud_run_shard()
+
+
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(description="Download IMAGE ads (US only)")
     p.add_argument("--project-id", default=DEFAULT_PROJECT_ID)
     p.add_argument("--gcs-bucket", default=DEFAULT_GCS_BUCKET)
@@ -277,11 +387,12 @@ def parse_args() -> CliArgs:
     p.add_argument("--user-agent", default=DEFAULT_USER_AGENT)
     p.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
     p.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
-    p.add_argument("--start-date")
-    p.add_argument("--end-date")
+    p.add_argument("--start-date", help="YYYY-MM-DD, or YYYY for that whole calendar year")
+    p.add_argument("--end-date", help="YYYY-MM-DD (inclusive), or YYYY for its last day")
     p.add_argument(
         "--order-by",
-        choices=["none", "date_asc", "date_desc", "advertiser"],
+        type=sys.intern,  # parsed value shares identity with the literals compared against downstream
+        choices=ORDER_BY_CHOICES,
         default="none",
     )
     p.add_argument("--skip-advertisers", nargs="*", default=[])
@@ -306,9 +417,9 @@ def parse_args() -> CliArgs:
     )
     p.add_argument(
         "--all-variants",
-        action="store_true",
+        action=argparse.BooleanOptionalAction,
         default=True,
-        help=("Capture and persist every detected variant (v1, v2, ...) instead of stopping after the first success."),
+        help="Capture and persist every detected variant (v1, v2, ...); --no-all-variants stops after the first success.",
     )
     p.add_argument(
         "--trace",
@@ -373,60 +484,24 @@ def parse_args() -> CliArgs:
         action="store_true",
         help="Re-run ads even if the ads table shows status='done' (default: skip existing successes)",
     )
+    return p
 
-    ns = p.parse_args()
+
+def parse_args(argv: Sequence[str] | None = None) -> CliArgs:
+    """Parse ``argv`` (default: ``sys.argv[1:]``) into validated ``CliArgs``."""
+    # The parser only depends on import-time defaults, so it is built once per process.
+    ns = _build_parser().parse_args(argv)
     _coerce_dates(ns)
-    validate_args(ns)
 
     # If running as a Cloud Run Job with multiple tasks, prefer task-index sharding by default.
-    # Only apply when the user did not explicitly set --shard or --shard-count.
-    try:
-        task_index = os.getenv("CLOUD_RUN_TASK_INDEX")
-        task_count = os.getenv("CLOUD_RUN_TASK_COUNT")
-        if task_index is not None and task_count is not None:
-            # Respect explicit CLI overrides: only use env if user left defaults (0 and 1).
-            if getattr(ns, "shard", 0) == 0 and getattr(ns, "shard_count", 1) == 1:
-                ns.shard = int(task_index)
-                ns.shard_count = int(task_count)
-    except Exception:
-        pass
+    # Respect explicit CLI overrides: only use env if user left defaults (0 and 1).
+    if _CLOUD_RUN_SHARD and ns.shard == 0 and ns.shard_count == 1:
+        ns.shard, ns.shard_count = _CLOUD_RUN_SHARD
+    validate_args(ns)
 
-    return CliArgs(
-        project_id=ns.project_id,
-        gcs_bucket=ns.gcs_bucket,
-        sql_conn=ns.sql_conn,
-        db_host=ns.db_host,
-        db_port=ns.db_port,
-        max_ads=ns.max_ads,
-        sql_limit=ns.sql_limit,
-        user_agent=ns.user_agent,
-        concurrency=ns.concurrency,
-        batch_size=ns.batch_size,
-        start_date=ns.start_date,
-        end_date=ns.end_date,
-        order_by=ns.order_by,
-        skip_advertisers=list(ns.skip_advertisers or []),
-        ad_id=ns.ad_id,
-        ad_url=ns.ad_url,
-        advertiser_id=ns.advertiser_id,
-        manifest_path=ns.manifest_path,
-        all_variants=ns.all_variants,
-        trace=ns.trace,
-        since_days=ns.since_days,
-        limit=ns.limit,
-        max_retries=ns.max_retries,
-        retry_base_ms=ns.retry_base_ms,
-        dry_run=ns.dry_run,
-        shard=ns.shard,
-        shard_count=ns.shard_count,
-        debug_frames=ns.debug_frames,
-        debug_html=ns.debug_html,
-        device_scale_factor=ns.device_scale_factor,
-        page_timeout_ms=ns.page_timeout_ms,
-        iframe_timeout_ms=ns.iframe_timeout_ms,
-        bq_location=ns.bq_location,
-        rescrape_done=ns.rescrape_done,
-    )
+    values = {f.name: getattr(ns, f.name) for f in fields(CliArgs)}
+    values["skip_advertisers"] = frozenset(map(sys.intern, ns.skip_advertisers or ()))
+    return CliArgs(**values)
 
 
 # ============================
@@ -457,52 +532,6 @@ def upsert_pending(
     )
 
 
-def link_asset_success(
-    con,
-    adv_id: str,
-    ad_id: str,
-    asset_id: str,
-    rmethod: str,
-    w: int,
-    h: int,
-    fbytes: int,
-    phash: str,
-    canonical_gcs: str,
-    variant_id: str = IMAGE_VARIANT_ID,
-    *,
-    dry_run: bool = False,
-    variant: int | None = None,  # ignored by DB; kept for logging parity
-    capture_method: str | None = None,
-    capture_target: str | None = None,
-    click_url: str | None = None,
-    ocr_text: str | None = None,
-    ocr_language: str | None = None,
-    ocr_confidence: float | None = None,
-) -> None:
-    return db_link_asset_success(
-        con,
-        ad_type="IMAGE",
-        advertiser_id=adv_id,
-        ad_id=ad_id,
-        variant_id=variant_id,
-        asset_id=asset_id,
-        render_method=rmethod,
-        width_px=w,
-        height_px=h,
-        file_bytes=fbytes,
-        phash=phash,
-        gcs_path=canonical_gcs,
-        capture_method=capture_method,
-        capture_target=capture_target,
-        scraper_version=get_scraper_version(),
-        click_url=click_url,
-        ocr_text=ocr_text,
-        ocr_language=ocr_language,
-        ocr_confidence=ocr_confidence,
-        dry_run=dry_run,
-    )
-
-
 def record_status(
     con,
     adv_id: str,
@@ -543,25 +572,48 @@ def record_error(
     )
 
 
-def ensure_asset_row(
+def finalize_ad(
     con,
+    adv_id: str,
+    ad_id: str,
     asset_id: str,
-    phash: str,
+    rmethod: str,
     w: int,
     h: int,
     fbytes: int,
+    phash: str,
     canonical_gcs: str,
+    variant_id: str = IMAGE_VARIANT_ID,
     *,
     dry_run: bool = False,
+    capture_method: str | None = None,
+    capture_target: str | None = None,
+    click_url: str | None = None,
+    ocr_text: str | None = None,
+    ocr_language: str | None = None,
+    ocr_confidence: float | None = None,
 ) -> None:
-    return db_ensure_asset_row(
+    """Ensure the asset row and link it to the variant in one DB round-trip."""
+    return db_finalize_ad(
         con,
+        ad_type="IMAGE",
+        advertiser_id=adv_id,
+        ad_id=ad_id,
+        variant_id=variant_id,
         asset_id=asset_id,
-        phash=phash,
+        render_method=rmethod,
         width_px=w,
         height_px=h,
         file_bytes=fbytes,
+        phash=phash,
         gcs_path=canonical_gcs,
+        capture_method=capture_method,
+        capture_target=capture_target,
+        scraper_version=get_scraper_version(),
+        click_url=click_url,
+        ocr_text=ocr_text,
+        ocr_language=ocr_language,
+        ocr_confidence=ocr_confidence,
         dry_run=dry_run,
     )
 
@@ -624,56 +676,76 @@ def _is_meaningful_src(u: str | None) -> bool:
     return not (u == "about:blank" or u.startswith("data:"))
 
 
-def _tile_selector_candidates(dom_index: int, variant_idx: int) -> list[str]:
+@lru_cache(maxsize=256)
+def _tile_selector_candidates(dom_index: int, variant_idx: int) -> tuple[str, ...]:
     """
     Generate selector candidates that cover both carousel and stand-alone layouts.
     """
     if dom_index <= 0 or variant_idx <= 0:
-        return []
-    return [
+        return ()
+    return (
         f".creative-container.creative-carousel > div:nth-child({dom_index})",
         f".creative-container > div.creative-sub-container:nth-of-type({variant_idx})",
         f".creative-container > div.creative-sub-container:nth-child({dom_index})",
         f".creative-container > div:nth-child({dom_index})",
-    ]
+    )
+
+
+_FIRST_MATCHING_SELECTOR_JS = "(sels)=>{for(let i=0;i<sels.length;i++){if(sels[i]&&document.querySelector(sels[i])) return i;} return -1;}"
+
+_REVEAL_FIRST_MATCHING_TILE_JS = """
+(sels) => {
+    for (let i = 0; i < sels.length; i++) {
+        const el = sels[i] && document.querySelector(sels[i]);
+        if (!el) continue;
+        el.scrollIntoView({block: 'center'});
+        el.classList?.remove('hidden'); el.removeAttribute('hidden');
+        return i;
+    }
+    return -1;
+}
+"""
+
+# Activate a tile and read back its iframe/img src in one round-trip. Two animation
+# frames let layout settle after the click; the timer caps the wait at the old 300 ms
+# sleep in case rAF is throttled.
+_ACTIVATE_AND_PROBE_TILE_JS = """
+(sel) => new Promise((resolve) => {
+    const el = document.querySelector(sel);
+    if (!el) return resolve({iframe: '', img: ''});
+    el.scrollIntoView({block: 'center'});
+    try { el.click(); } catch {}
+    el.classList?.remove('hidden');
+    el.removeAttribute('hidden');
+    el.setAttribute('aria-hidden', 'false');
+    let done = false;
+    const read = () => {
+        if (done) return;
+        done = true;
+        const ifr = el.querySelector('iframe');
+        const im = el.querySelector('img');
+        resolve({iframe: (ifr && ifr.getAttribute('src')) || '', img: (im && im.getAttribute('src')) || ''});
+    };
+    requestAnimationFrame(() => requestAnimationFrame(read));
+    setTimeout(read, 300);
+})
+"""
 
 
 async def _activate_and_probe_tile(page: Page, dom_index: int, variant_idx: int, ad_url: str) -> dict[str, str]:
     selectors = _tile_selector_candidates(dom_index, variant_idx)
     sel_variant = selectors[0] if selectors else ""
-    for sel in selectors:
-        if not sel:
-            continue
+    if selectors:
         try:
-            handle = await page.query_selector(sel)
+            first = await page.evaluate(_FIRST_MATCHING_SELECTOR_JS, selectors)
         except Exception:
-            handle = None
-        if handle:
-            sel_variant = sel
-            try:
-                await handle.dispose()
-            except Exception:
-                pass
-            break
+            first = -1
+        if first >= 0:
+            sel_variant = selectors[first]
     if not sel_variant:
         sel_variant = f".creative-container > div:nth-child({max(dom_index, 1)})"
     try:
-        await page.evaluate(
-            "(sel)=>{const el=document.querySelector(sel); if(el){"
-            " el.scrollIntoView({block:'center'}); try{el.click();}catch{} "
-            " el.classList?.remove('hidden'); el.removeAttribute('hidden'); el.setAttribute('aria-hidden','false'); }}",
-            sel_variant,
-        )
-        await page.wait_for_timeout(300)
-    except Exception:
-        pass
-    try:
-        probed = await page.evaluate(
-            "(sel)=>{const el=document.querySelector(sel); if(!el) return {iframe:'',img:''}; "
-            "const ifr=el.querySelector('iframe'); const im=el.querySelector('img'); "
-            "return {iframe:(ifr&&ifr.getAttribute('src'))||'', img:(im&&im.getAttribute('src'))||''};}",
-            sel_variant,
-        )
+        probed = await page.evaluate(_ACTIVATE_AND_PROBE_TILE_JS, sel_variant)
     except Exception:
         probed = {"iframe": "", "img": ""}
     iframe_src = probed.get("iframe") or ""
@@ -706,9 +778,98 @@ def _stop_after_first(args: CliArgs | None) -> bool:
     return not (args and args.all_variants)
 
 
+class _WarmContext:
+    """
+    One reusable BrowserContext per consumer.
+
+    Creating a context is among Playwright's most expensive calls, and a fresh one
+    also starts with a cold HTTP cache. Between ads the context is reset instead of
+    torn down: storage (localStorage, IndexedDB, service workers, caches) is cleared
+    over CDP for GATC and for every origin a page or frame navigated to during the ad
+    (creative iframes, ad servers, advertiser CDNs), pages are closed (which drops
+    sessionStorage) and cookies are cleared. It is recycled after CONTEXT_REUSE_MAX_ADS
+    ads or when the browser it belongs to is replaced.
+    """
+
+    def __init__(self) -> None:
+        self.context = None
+        self._browser = None
+        self._uses = 0
+        self._origins: set[str] = set()
+
+    async def acquire(self, browser, *, user_agent: str, device_scale_factor: int):
+        if self.context is not None and (self._browser is not browser or self._uses >= CONTEXT_REUSE_MAX_ADS):
+            await self.discard()
+        if self.context is None:
+            context = await browser.new_context(user_agent=user_agent, device_scale_factor=device_scale_factor)
+            context.on("page", self._watch_page)
+            self.context = context
+            self._browser = browser
+            self._uses = 0
+        self._uses += 1
+        return self.context
+
+    def _watch_page(self, page) -> None:
+        page.on("framenavigated", lambda frame: self._note_origin(frame.url))
+
+    def _note_origin(self, url: str) -> None:
+        parts = urllib.parse.urlsplit(url or "")
+        if parts.scheme in ("http", "https") and parts.netloc:
+            self._origins.add(f"{parts.scheme}://{parts.netloc}")
+
+    async def release(self) -> None:
+        """Reset per-ad state; drop the context instead if the reset fails."""
+        if self.context is None:
+            return
+        try:
+            pages = list(self.context.pages)
+            for p in pages:
+                for frame in p.frames:
+                    self._note_origin(frame.url)
+            origins = [GATC_ORIGIN, *sorted(self._origins - {GATC_ORIGIN})]
+            self._origins.clear()
+            # CDP sessions attach to a page; the storage command itself is origin-wide.
+            page = pages[0] if pages else await self.context.new_page()
+            cdp = await self.context.new_cdp_session(page)
+            try:
+                for origin in origins:
+                    await cdp.send("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+            finally:
+                await cdp.detach()
+            for p in list(self.context.pages):
+                await p.close()
+            await self.context.clear_cookies()
+        except Exception:
+            await self.discard()
+
+    async def discard(self) -> None:
+        context, self.context, self._browser = self.context, None, None
+        self._origins.clear()
+        if context is not None:
+            try:
+                await context.close()
+            except Exception:
+                pass
+
+
+@lru_cache(maxsize=1)
+def _shared_http_adapter() -> requests.adapters.HTTPAdapter:
+    """Process-wide adapter so every per-ad session reuses the same keep-alive connection pools."""
+    return requests.adapters.HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=requests.adapters.Retry(total=2, backoff_factor=0.3),
+    )
+
+
 def _make_http(user_agent: str, referer: str) -> requests.Session:
+    # Sessions stay per ad (the Referer differs); the mounted adapter, which owns the
+    # connections, is shared so creative hosts are not re-handshaken for every ad.
     s = requests.Session()
     s.headers.update({"User-Agent": user_agent, "Referer": referer})
+    adapter = _shared_http_adapter()
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
     return s
 
 
@@ -753,7 +914,7 @@ async def fetch_sadbundle_image_bytes(
     try:
         # Resolve relative src against the sadbundle frame URL
         abs_url = urllib.parse.urljoin(frame_url, src)
-        resp = http.get(abs_url, timeout=20)
+        resp = await asyncio.to_thread(http.get, abs_url, timeout=20)
         resp.raise_for_status()
         return resp.content
     except Exception:
@@ -785,6 +946,12 @@ async def _freeze_animations(page: Page) -> None:
         pass
 
 
+async def _png_screenshot(target, **kwargs: Any) -> bytes:
+    """PNG screenshot of a page, element handle or locator, bounded by ``_SCREENSHOT_SLOTS``."""
+    async with _SCREENSHOT_SLOTS:
+        return await target.screenshot(type="png", **kwargs)
+
+
 # --- Lightweight visual similarity helpers (no external deps beyond Pillow) ---
 
 
@@ -793,24 +960,57 @@ def _ahash64(png_bytes: bytes) -> int:
     try:
         with Image.open(BytesIO(png_bytes)) as im:
             im = im.convert("L").resize((8, 8))
-            pixels = list(im.getdata())
-            avg = sum(pixels) / 64.0
-            bits = 0
-            for i, p in enumerate(pixels):
-                if p >= avg:
-                    bits |= 1 << i
-            return bits
+            pixels = np.frombuffer(im.tobytes(), dtype=np.uint8)
+            # Bit i is set when pixel i (row-major) is >= the mean, same as the old per-pixel loop.
+            bits = np.packbits(pixels >= pixels.mean(), bitorder="little")
+            return int.from_bytes(bits.tobytes(), "little")
     except Exception:
         return -1
 
 
+async def _ahash64_async(png_bytes: bytes) -> int:
+    if SETTLE_HASH_OFFLOAD:
+        return await asyncio.to_thread(_ahash64, png_bytes)
+    return _ahash64(png_bytes)
+
+
 def _hamdist64(a: int, b: int) -> int:
     if a < 0 or b < 0:
         return 64
     return (a ^ b).bit_count()
 
 
-async def _settle_screenshot(
+async def _settle_screenshot(get_png_coro, **kwargs: Any) -> bytes:
+    """Settle like :func:`_settle_screenshot_hashed` and return only the PNG bytes."""
+    png, _ = await _settle_screenshot_hashed(get_png_coro, **kwargs)
+    return png
+
+
+# True once the document can no longer change on its own: images decoded, fonts loaded,
+# no running Web Animations and nothing that animates outside them (canvas, video, GIF,
+# or a child frame this document cannot see into).
+_DOC_QUIESCENT_JS = """
+() => document.readyState === 'complete'
+    && document.fonts.status === 'loaded'
+    && Array.from(document.images).every((img) => img.complete)
+    && !document.querySelector('canvas, video, iframe, img[src*=".gif"]')
+    && !document.getAnimations().some((a) => a.playState === 'running')
+"""
+
+
+async def _quiescent_or_settled_screenshot(page: Page, get_png_coro, *, quiescent_timeout_ms: int, **settle_kwargs: Any) -> bytes:
+    """
+    Take a single screenshot if `page` reports itself static within `quiescent_timeout_ms`;
+    otherwise (animated or still loading) fall back to the sampling :func:`_settle_screenshot`.
+    """
+    try:
+        await page.wait_for_function(_DOC_QUIESCENT_JS, timeout=quiescent_timeout_ms)
+    except Exception:
+        return await _settle_screenshot(get_png_coro, **settle_kwargs)
+    return await get_png_coro()
+
+
+async def _settle_screenshot_hashed(
     get_png_coro,
     *,
     max_wait_ms: int = DEFAULT_SETTLE_MAX_MS,
@@ -818,7 +1018,8 @@ async def _settle_screenshot(
     interval_ms: int = DEFAULT_SETTLE_INTERVAL_MS,
     near_epsilon: int = 3,
     min_observe_ms: int = DEFAULT_SETTLE_MIN_OBSERVE_MS,
-) -> bytes:
+    fast_exit_stable_ms: int | None = None,
+) -> tuple[bytes, int]:
     """
     Observe repeated screenshots until the image is visually stable.
     - Stability = aHash distance <= near_epsilon over a continuous window of `min_stable_ms`.
@@ -827,8 +1028,14 @@ async def _settle_screenshot(
     - IMPORTANT: We do **not** return on the first stable window; we keep sampling until
       `max_wait_ms` and return the **last** qualifying stable frame observed. This biases us
       toward the true end-of-sequence when animations include intermittent pauses.
-    Returns the best stable PNG (last window) or the latest sample on timeout.
+    - Exception: a frame that has never changed since the first sample and has held for
+      `fast_exit_stable_ms` (default `min_stable_ms * SETTLE_FAST_EXIT_FACTOR`) is treated as
+      a static creative and returned immediately; 0 disables the fast exit.
+    Returns the best stable PNG (last window) or the latest sample on timeout, together
+    with its aHash so callers can compare against it without decoding the PNG again.
     """
+    if fast_exit_stable_ms is None:
+        fast_exit_stable_ms = min_stable_ms * SETTLE_FAST_EXIT_FACTOR
     loop = asyncio.get_event_loop()
     t0 = loop.time()
     stable_start = None
@@ -836,9 +1043,10 @@ async def _settle_screenshot(
 
     # Track the last stable window that satisfied the threshold
     best_png: bytes | None = None
+    best_hash = -1
 
     png_last = await get_png_coro()
-    h_last = _ahash64(png_last)
+    h_last = await _ahash64_async(png_last)
 
     while (loop.time() - t0) * 1000.0 < max_wait_ms:
         await asyncio.sleep(max(0, interval_ms) / 1000.0)
@@ -846,9 +1054,13 @@ async def _settle_screenshot(
             png_now = await get_png_coro()
         except Exception:
             break
-        h_now = _ahash64(png_now)
-
-        near_identical = (png_now == png_last) or (_hamdist64(h_now, h_last) <= near_epsilon)
+        if png_now == png_last:
+            # Byte-identical frame (the usual case once a page is quiet): skip the decode.
+            h_now = h_last
+            near_identical = True
+        else:
+            h_now = await _ahash64_async(png_now)
+            near_identical = _hamdist64(h_now, h_last) <= near_epsilon
         now = loop.time()
         if near_identical:
             if stable_start is None:
@@ -858,6 +1070,9 @@ async def _settle_screenshot(
             if long_enough and observed_enough:
                 # Update the candidate **without returning**; we want the last stable window
                 best_png = png_now
+                best_hash = h_now
+                if fast_exit_stable_ms > 0 and not saw_meaningful_change and (now - stable_start) * 1000.0 >= fast_exit_stable_ms:
+                    return png_now, h_now
         else:
             # Motion detected; reset stability window and record that we've seen movement
             stable_start = None
@@ -867,8 +1082,16 @@ async def _settle_screenshot(
 
     # Prefer the **last** stable window if any; otherwise return latest observed frame
     if best_png is not None:
-        return best_png
-    return png_last
+        return best_png, best_hash
+    return png_last, h_last
+
+
+_GWD_PROBE_JS = """
+() => ({
+    meta: !!document.querySelector("script[type='text/gwd-admetadata']"),
+    elem: !!document.querySelector('gwd-google-ad, gwd-page, #gwd-ad, .gwd-page-content'),
+})
+"""
 
 
 async def sniff_gwd(page: Page, iframe_timeout_ms: int) -> dict[str, object]:
@@ -884,34 +1107,31 @@ async def sniff_gwd(page: Page, iframe_timeout_ms: int) -> dict[str, object]:
 
     async def _check(doc) -> tuple[bool, str | None]:
         try:
-            has_meta = await doc.evaluate("() => !!document.querySelector(\"script[type='text/gwd-admetadata']\")")
+            probe = await doc.evaluate(_GWD_PROBE_JS)
         except Exception:
-            has_meta = False
-        if has_meta:
+            return False, None  # cross-origin or detached frames; ignore
+        if probe.get("meta"):
             return True, "admetadata"
-
-        try:
-            has_elem = await doc.evaluate("() => !!document.querySelector('gwd-google-ad, gwd-page, #gwd-ad, .gwd-page-content')")
-        except Exception:
-            has_elem = False
-
-        return (bool(has_elem), "gwd-element" if has_elem else None)
+        if probe.get("elem"):
+            return True, "gwd-element"
+        return False, None
 
     # Check current document
     is_gwd, marker = await _check(page)
     if is_gwd:
         return {"is_gwd": True, "marker": marker, "found_in_child": False}
 
-    # Cheap peek into same-origin children (no re-navigation)
-    for fr in page.frames:
-        if fr == page.main_frame:
-            continue
-        try:
-            ok, m = await _check(fr)
-        except Exception:
-            ok, m = False, None  # cross-origin or other failures; ignore
-        if ok:
-            return {"is_gwd": True, "marker": f"child:{m}", "found_in_child": True}
+    # Cheap peek into same-origin children (no re-navigation), all frames at once;
+    # the first frame to report a marker wins and the remaining probes are cancelled.
+    tasks = [asyncio.create_task(_check(fr)) for fr in page.frames if fr != page.main_frame]
+    try:
+        for fut in asyncio.as_completed(tasks):
+            ok, m = await fut
+            if ok:
+                return {"is_gwd": True, "marker": f"child:{m}", "found_in_child": True}
+    finally:
+        for task in tasks:
+            task.cancel()
 
     return {"is_gwd": False, "marker": None, "found_in_child": False}
 
@@ -932,7 +1152,7 @@ async def stabilized_host_iframe_screenshot(
     """
 
     async def _grab():
-        return await fe.screenshot(type="png")
+        return await _png_screenshot(fe)
 
     try:
         return await _settle_screenshot(
@@ -947,6 +1167,27 @@ async def stabilized_host_iframe_screenshot(
         return None
 
 
+_DEFAULT_SADBUNDLE_SELECTORS = (
+    # GWD-ish
+    "#page1",
+    ".gwd-page-content",
+    "gwd-page",
+    ".gwd-page-container",
+    "gwd-pagedeck",
+    "#pagedeck",
+    "gwd-google-ad",
+    "div[class*='gwd-page-']",
+    # Templated SADBUNDLE (non-GWD) — the ones you pasted
+    "#mys-content",
+    "#mys-wrapper",
+    ".x-layout",
+    "svg.image",
+    # Image-wrapper container (as last resort when fetch fails)
+    "#google_image_div",
+)
+_DEFAULT_SADBUNDLE_JOINED = ", ".join(_DEFAULT_SADBUNDLE_SELECTORS)
+
+
 async def screenshot_sadbundle_element(
     frame_page: Page,
     iframe_timeout_ms: int,
@@ -967,27 +1208,14 @@ async def screenshot_sadbundle_element(
     except Exception:
         pass
 
-    selectors = preferred_selectors or [
-        # GWD-ish
-        "#page1",
-        ".gwd-page-content",
-        "gwd-page",
-        ".gwd-page-container",
-        "gwd-pagedeck",
-        "#pagedeck",
-        "gwd-google-ad",
-        "div[class*='gwd-page-']",
-        # Templated SADBUNDLE (non-GWD) — the ones you pasted
-        "#mys-content",
-        "#mys-wrapper",
-        ".x-layout",
-        "svg.image",
-        # Image-wrapper container (as last resort when fetch fails)
-        "#google_image_div",
-    ]
+    if preferred_selectors:
+        selectors: Sequence[str] = preferred_selectors
+        joined = ", ".join(preferred_selectors)
+    else:
+        selectors, joined = _DEFAULT_SADBUNDLE_SELECTORS, _DEFAULT_SADBUNDLE_JOINED
 
     try:
-        await frame_page.wait_for_selector(", ".join(selectors), timeout=iframe_timeout_ms)
+        await frame_page.wait_for_selector(joined, timeout=iframe_timeout_ms)
     except Exception:
         return None, None
 
@@ -1012,8 +1240,8 @@ async def screenshot_sadbundle_element(
     # Phase 1: let the element visually settle without freezing (handles brief intentional pauses)
     locator = frame_page.locator(sel).first
     try:
-        png_settled = await _settle_screenshot(
-            lambda: locator.screenshot(type="png"),
+        png_settled, h_settled = await _settle_screenshot_hashed(
+            lambda: _png_screenshot(locator),
             max_wait_ms=DEFAULT_SETTLE_MAX_MS,
             min_stable_ms=DEFAULT_SETTLE_MIN_STABLE_MS,
             interval_ms=DEFAULT_SETTLE_INTERVAL_MS,
@@ -1030,15 +1258,15 @@ async def screenshot_sadbundle_element(
     except Exception:
         pass
     try:
-        png_frozen = await locator.screenshot(type="png")
+        png_frozen = await _png_screenshot(locator)
     except Exception:
         return png_settled, sel
 
     # If freezing changed the frame materially, re-settle briefly post-freeze
-    if _hamdist64(_ahash64(png_settled), _ahash64(png_frozen)) > 4:
+    if _hamdist64(h_settled, await _ahash64_async(png_frozen)) > 4:
         try:
             png_final = await _settle_screenshot(
-                lambda: locator.screenshot(type="png"),
+                lambda: _png_screenshot(locator),
                 max_wait_ms=FLETCH_SETTLE_MAX_MS,
                 min_stable_ms=FLETCH_SETTLE_MIN_STABLE_MS,
                 interval_ms=DEFAULT_SETTLE_INTERVAL_MS,
@@ -1051,6 +1279,40 @@ async def screenshot_sadbundle_element(
     return png_frozen, sel
 
 
+def _destination_click_url(url: str) -> str | None:
+    """Normalize ``url`` and drop it (None) when it points at Google infra or a redirector.
+
+    normalize_click_url already unwraps googleadservices adurl targets and returns None for
+    anything it cannot parse, and its output always re-splits cleanly, so no exception
+    handling is needed here.
+    """
+    norm = normalize_click_url(url)
+    if not norm or urllib.parse.urlsplit(norm).netloc.lower().endswith(_NON_DESTINATION_HOSTS):
+        return None
+    return norm
+
+
+def _iter_json_strings(obj: Any) -> Iterator[str]:
+    """Yield every string in a decoded JSON value, depth-first in document order."""
+    if isinstance(obj, str):
+        yield obj
+    elif isinstance(obj, list):
+        for item in obj:
+            yield from _iter_json_strings(item)
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            yield from _iter_json_strings(value)
+
+
+def _urls_in_json(obj: Any) -> list[str]:
+    """All http(s) URLs in the strings of ``obj``, in order, found with one regex pass.
+
+    Strings are joined with newlines, which the URL pattern never crosses, so each match
+    stays within a single string.
+    """
+    return _HTTP_URL_RE.findall("\n".join(_iter_json_strings(obj)))
+
+
 async def extract_click_urls_from_frame(frame) -> list[str]:
     """
     Extract click-through URLs from a sadbundle frame.
@@ -1064,29 +1326,12 @@ async def extract_click_urls_from_frame(frame) -> list[str]:
            return the href itself.
     We never navigate; we only parse DOM attributes.
     """
-    found: list[str] = []
+    found: dict[str, None] = {}  # insertion-ordered set
 
     def _add(url: str) -> None:
-        norm = normalize_click_url(url)
-        if not norm:
-            return
-        try:
-            parsed = urllib.parse.urlparse(norm)
-            host = (parsed.netloc or "").lower()
-            # Reject obvious non-destination or infra hosts
-            if host.endswith("google.com") and not host.endswith("googleadservices.com"):
-                return
-            if host.endswith("g.doubleclick.net") or host.endswith("doubleclick.net"):
-                return
-            if host.endswith("tpc.googlesyndication.com") or host.endswith("pagead2.googlesyndication.com"):
-                return
-            # After normalization, googleadservices links should have been unwrapped to their adurl target.
-            if host.endswith("googleadservices.com"):
-                return
-        except Exception:
-            pass
-        if norm not in found:
-            found.append(norm)
+        norm = _destination_click_url(url)
+        if norm:
+            found[norm] = None
 
     # ---- 1) meta[data-asoch-meta] path ----
     try:
@@ -1108,12 +1353,13 @@ async def extract_click_urls_from_frame(frame) -> list[str]:
                 def _walk(obj):
                     if isinstance(obj, str) and obj.startswith("http"):
                         try:
-                            parsed = urllib.parse.urlparse(obj)
-                            qs = urllib.parse.parse_qs(parsed.query)
+                            parsed = urllib.parse.urlsplit(obj)
                             # Prefer adurl if present (Google redirector)
-                            if parsed.netloc.endswith("googleadservices.com") and "adurl" in qs and qs["adurl"]:
-                                _add(qs["adurl"][0])
-                            elif parsed.scheme in ("http", "https") and not parsed.netloc.endswith("googleadservices.com"):
+                            if parsed.netloc.endswith("googleadservices.com"):
+                                adurl = urllib.parse.parse_qs(parsed.query).get("adurl")
+                                if adurl:
+                                    _add(adurl[0])
+                            elif parsed.scheme in ("http", "https"):
                                 _add(obj)
                         except Exception:
                             pass
@@ -1139,13 +1385,15 @@ async def extract_click_urls_from_frame(frame) -> list[str]:
         )
         for href in hrefs or []:
             try:
-                parsed = urllib.parse.urlparse(href)
+                parsed = urllib.parse.urlsplit(href)
                 if parsed.scheme not in ("http", "https"):
                     continue
-                qs = urllib.parse.parse_qs(parsed.query)
-                if parsed.netloc.endswith("googleadservices.com") and "adurl" in qs and qs["adurl"]:
-                    _add(qs["adurl"][0])
-                elif not parsed.netloc.endswith("googleadservices.com"):
+                if parsed.netloc.endswith("googleadservices.com"):
+                    # Only redirectors need their query parsed, to unwrap adurl.
+                    adurl = urllib.parse.parse_qs(parsed.query).get("adurl")
+                    if adurl:
+                        _add(adurl[0])
+                else:
                     _add(href)
             except Exception:
                 continue
@@ -1162,18 +1410,8 @@ async def extract_click_urls_from_frame(frame) -> list[str]:
             meta_payloads = []
 
         def _walk_meta(obj) -> None:
-            if isinstance(obj, str):
-                if obj.startswith("http"):
-                    _add(obj)
-                else:
-                    for match in re.findall(r"https?://[^\s'\"]+", obj):
-                        _add(match)
-            elif isinstance(obj, list):
-                for item in obj:
-                    _walk_meta(item)
-            elif isinstance(obj, dict):
-                for value in obj.values():
-                    _walk_meta(value)
+            for match in _urls_in_json(obj):
+                _add(match)
 
         for raw in meta_payloads or []:
             if not raw:
@@ -1184,11 +1422,14 @@ async def extract_click_urls_from_frame(frame) -> list[str]:
                 parsed_meta = json.loads(decoded)
             except Exception:
                 parsed_meta = None
+            # Scan the raw text only when it is not valid JSON; the parsed tree already holds
+            # every URL, and the raw text would add escaped (\/, \u0026) duplicates.
             if parsed_meta is not None:
                 _walk_meta(parsed_meta)
-            _walk_meta(decoded)
+            else:
+                _walk_meta(decoded)
 
-    return found
+    return list(found)
 
 
 # ============================
@@ -1196,6 +1437,77 @@ async def extract_click_urls_from_frame(frame) -> list[str]:
 # ============================
 
 
+_HTTP_PREFIXES = ("http://", "https://")
+
+
+# The fletch extractors see the same redirector/beacon URLs many times per creative
+# (one per impression ping), so the split and the adurl lookup are memoized.
+@lru_cache(maxsize=4096)
+def _split_click_url(url: str) -> tuple[str, str, str, str]:
+    """Return ``(scheme, host, path, query)`` for ``url`` with host and path lowercased."""
+    parsed = urllib.parse.urlsplit(url)
+    return parsed.scheme, parsed.netloc.lower(), parsed.path.lower(), parsed.query
+
+
+@lru_cache(maxsize=4096)
+def _adurl_of(query: str) -> str | None:
+    """First ``adurl`` parameter of a redirector query string, if any."""
+    values = urllib.parse.parse_qs(query).get("adurl")
+    return values[0] if values else None
+
+
+# Hosts that need a closer look in fletch click candidates: simgad/discover_ads asset
+# URLs on tpc are noise, conversion pings and googleadservices wrap an adurl target.
+_FLETCH_REDIRECT_OR_ASSET_HOSTS = ("tpc.googlesyndication.com", "googleads.g.doubleclick.net", "googleadservices.com")
+
+
+def _fletch_click_target(url: str) -> str | None:
+    """Destination for a fletch click candidate: ``url`` itself, its unwrapped ``adurl``, or None for noise."""
+    # Prefix gate (case-insensitive like the URL scheme) before any parsing.
+    if not isinstance(url, str) or not url[:8].lower().startswith(_HTTP_PREFIXES):
+        return None
+    try:
+        _, host, path, query = _split_click_url(url)
+    except ValueError:  # e.g. malformed IPv6 netloc
+        return None
+    if not host.endswith(_FLETCH_REDIRECT_OR_ASSET_HOSTS):
+        return url  # the common case, settled by one suffix check
+    if host.endswith("tpc.googlesyndication.com"):
+        return None if path.startswith("/simgad") or "discover_ads" in path else url
+    if host.endswith("googleadservices.com") or "pagead/conversion" in path:
+        # keep only if it encodes an adurl
+        return _adurl_of(query) or None
+    return url
+
+
+_FLETCH_CLICK_PROBE_JS = (
+    """
+() => {
+    let adDataFields = null;
+    try {
+        if (typeof adData === 'object' && adData) {
+            adDataFields = {
+                redirect_url: adData.redirect_url || null,
+                destination_url: adData.destination_url || null,
+                google_click_url: adData.google_click_url || null,
+            };
+        }
+    } catch {}
+    return {
+        anchors: """
+    + _FLETCH_ANCHORS_JS
+    + """
+            .map(sel => { const a = document.querySelector(sel); return a ? a.getAttribute('href') : null; })
+            .filter(Boolean),
+        adData: adDataFields,
+        metaPayloads: Array.from(document.querySelectorAll('meta[data-asoch-meta]'))
+            .map(m => m.getAttribute('data-asoch-meta') || ''),
+    };
+}
+"""
+)
+
+
 async def extract_click_urls_from_fletch(frame) -> list[str]:
     """
     Extract click-through URLs from a FLETCH image creative (discover tile).
@@ -1208,111 +1520,48 @@ async def extract_click_urls_from_fletch(frame) -> list[str]:
     Redirector noise is filtered. For googleadservices/doubleclick URLs, only the decoded
     `adurl` target is returned.
     """
-    out: list[str] = []
+    out: dict[str, None] = {}  # insertion-ordered set
 
     def _maybe_add(url: str) -> None:
-        if not url:
-            return
-        try:
-            parsed = urllib.parse.urlparse(url)
-            if parsed.scheme not in ("http", "https"):
-                return
-            # Filter obvious noise
-            host = parsed.netloc.lower()
-            path = (parsed.path or "").lower()
-            if host.endswith("tpc.googlesyndication.com") and path.startswith("/simgad"):
-                return
-            if host.endswith("tpc.googlesyndication.com") and "discover_ads" in path:
-                return
-            if host.endswith("googleads.g.doubleclick.net") and "pagead/conversion" in path:
-                # keep only if it encodes an adurl
-                qs = urllib.parse.parse_qs(parsed.query)
-                if qs.get("adurl"):
-                    url = qs["adurl"][0]
-                else:
-                    return
-            if host.endswith("googleadservices.com"):
-                qs = urllib.parse.parse_qs(parsed.query)
-                if qs.get("adurl"):
-                    url = qs["adurl"][0]
-                else:
-                    return
-            # De-duplicate while preserving order
-            if url not in out:
-                out.append(url)
-        except Exception:
-            return
+        target = _fletch_click_target(url)
+        if target:
+            out[target] = None  # de-duplicate while preserving order
 
-    # ---- 0) Anchor-first: honor the three well-known IDs if present ----
+    # One round-trip for everything but the inline-script scan: well-known anchors,
+    # adData fields and meta payloads. Scripts can be large, so they are only fetched
+    # if every other source comes up empty.
     try:
-        anchor_hrefs = await frame.evaluate(
-            "() => ['#image-anchor','#header','#visurl']"
-            ".map(sel => { const a = document.querySelector(sel); return a ? a.getAttribute('href') : null; })"
-            ".filter(Boolean)"
-        )
+        probe = await frame.evaluate(_FLETCH_CLICK_PROBE_JS)
     except Exception:
-        anchor_hrefs = None
+        probe = None
+    if not isinstance(probe, dict):
+        probe = {}
 
+    # ---- 0) Anchor-first: honor the three well-known IDs if present ----
+    anchor_hrefs = probe.get("anchors")
     if anchor_hrefs:
         for href in anchor_hrefs:
             _maybe_add(href)
-        return out
+        return list(out)
 
     # ---- 1) adData path (fallback) ----
-    try:
-        data = await frame.evaluate(
-            "() => { try { return (typeof adData === 'object' && adData) ? ({ "
-            "redirect_url: adData.redirect_url || null, "
-            "destination_url: adData.destination_url || null, "
-            "google_click_url: adData.google_click_url || null "
-            "}) : null; } catch { return null; } }"
-        )
-    except Exception:
-        data = None
-
+    data = probe.get("adData")
     if isinstance(data, dict):
         _maybe_add(data.get("redirect_url") or "")
         _maybe_add(data.get("destination_url") or "")
         _maybe_add(data.get("google_click_url") or "")
 
-    # ---- 2) Legacy anchors (rare for FLETCH image) ----
-    if not out:
-        for sel in ("#image-anchor", "#header", "#visurl"):
-            try:
-                href = await frame.evaluate(
-                    "(s) => { const a = document.querySelector(s); return a ? a.getAttribute('href') : null; }",
-                    sel,
-                )
-            except Exception:
-                href = None
-            if href:
-                _maybe_add(href)
-
-    # ---- 3) Fallback: meta[data-asoch-meta] payloads ----
+    # ---- 2) Fallback: meta[data-asoch-meta] payloads ----
     if not out:
-        try:
-            meta_payloads = await frame.evaluate(
-                "() => Array.from(document.querySelectorAll('meta[data-asoch-meta]') || [])"
-                ".map(m => m.getAttribute('data-asoch-meta') || '')"
-            )
-        except Exception:
-            meta_payloads = []
+        meta_payloads = probe.get("metaPayloads")
 
         def _walk_meta(obj) -> None:
-            if isinstance(obj, str):
-                if obj.startswith("http"):
-                    _maybe_add(obj)
-                else:
-                    for match in re.findall(r"https?://[^\s\'\"]+", obj):
-                        _maybe_add(match)
-            elif isinstance(obj, list):
-                for item in obj:
-                    _walk_meta(item)
-            elif isinstance(obj, dict):
-                for value in obj.values():
-                    _walk_meta(value)
+            for match in _urls_in_json(obj):
+                _maybe_add(match)
 
-        for raw in meta_payloads or []:
+        # Adjacent tiles often repeat the same payload; parse each distinct one once. Only
+        # the primary (first) URL is persisted, so stop after the first payload that yields one.
+        for raw in dict.fromkeys(meta_payloads or []):
             if not raw:
                 continue
             decoded = html.unescape(raw).replace("&amp;", "&")
@@ -1320,25 +1569,31 @@ async def extract_click_urls_from_fletch(frame) -> list[str]:
                 parsed: Any = json.loads(decoded)
             except Exception:
                 parsed = None
+            # Scan the raw text only when it is not valid JSON; the parsed tree already holds
+            # every URL, and the raw text would add escaped (\/, \u0026) duplicates.
             if parsed is not None:
                 _walk_meta(parsed)
-            _walk_meta(decoded)
+            else:
+                _walk_meta(decoded)
+            if out:
+                break
 
-    # ---- 4) Fallback: scan inline <script> tags for URL-like strings ----
+    # ---- 3) Fallback: scan inline <script> tags for URL-like strings ----
     if not out:
         try:
             scripts_text = await frame.evaluate("() => Array.from(document.scripts || []).map(s => s.textContent || '').join('\\n')")
         except Exception:
             scripts_text = None
-        if scripts_text:
-            try:
-                candidates = re.findall(r"https?://[^\s\'\"]+", scripts_text)
-                for u in candidates:
+        if isinstance(scripts_text, str):
+            # Redirectors carry the destination as adurl; try those before paying for every
+            # beacon/library URL in the scripts, which is the broad scan below.
+            for u in _SCRIPT_REDIRECT_URL_RE.findall(scripts_text):
+                _maybe_add(u)
+            if not out:
+                for u in _HTTP_URL_RE.findall(scripts_text):
                     _maybe_add(u)
-            except Exception:
-                pass
 
-    return out
+    return list(out)
 
 
 async def extract_click_urls_from_fletch_on_host(page: Page) -> list[str]:
@@ -1346,33 +1601,12 @@ async def extract_click_urls_from_fletch_on_host(page: Page) -> list[str]:
     Click URL extraction for FLETCH rendered on the host page (no inner navigation).
     Scope to the creative container; prefer well-known anchors; unwrap adurl targets.
     """
-    found: list[str] = []
+    found: dict[str, None] = {}  # insertion-ordered set
 
     def _maybe_add(url: str) -> None:
-        if not url:
-            return
-        try:
-            p = urllib.parse.urlparse(url)
-            if p.scheme not in ("http", "https"):
-                return
-            host = p.netloc.lower()
-            path = (p.path or "").lower()
-            if host.endswith("tpc.googlesyndication.com") and (path.startswith("/simgad") or "discover_ads" in path):
-                return
-            if host.endswith("googleads.g.doubleclick.net") and "pagead/conversion" in path:
-                qs = urllib.parse.parse_qs(p.query)
-                url = qs.get("adurl", [None])[0] or ""
-                if not url:
-                    return
-            if host.endswith("googleadservices.com"):
-                qs = urllib.parse.parse_qs(p.query)
-                url = qs.get("adurl", [None])[0] or ""
-                if not url:
-                    return
-            if url not in found:
-                found.append(url)
-        except Exception:
-            return
+        target = _fletch_click_target(url)
+        if target:
+            found[target] = None
 
     try:
         hrefs = await page.evaluate(
@@ -1381,8 +1615,7 @@ async def extract_click_urls_from_fletch_on_host(page: Page) -> list[str]:
             "  if (!c) return [];"
             "  const out = [];"
             "  const push = (v) => { if (v) out.push(v); };"
-            "  ['#image-anchor', '#header', '#visurl']"
-            "    .forEach(sel => { const a = c.querySelector(sel); push(a && a.getAttribute('href')); });"
+            "  " + _FLETCH_ANCHORS_JS + ".forEach(sel => { const a = c.querySelector(sel); push(a && a.getAttribute('href')); });"
             "  const ifr = c.querySelector("
             "    \"iframe[id^='google_ad_'], iframe[name^='google_ads_iframe_'], "
             "     iframe[src*='discover_ads'], iframe[src*='googleads']\");"
@@ -1394,14 +1627,11 @@ async def extract_click_urls_from_fletch_on_host(page: Page) -> list[str]:
         hrefs = []
 
     for h in hrefs or []:
-        try:
-            norm = normalize_click_url(h)
-        except Exception:
-            norm = None
+        norm = normalize_click_url(h)  # never raises; None for unusable input
         if norm:
             _maybe_add(norm)
 
-    return found
+    return list(found)
 
 
 # ============================
@@ -1417,8 +1647,7 @@ async def is_fletch(doc) -> bool:
         return await doc.evaluate(
             "() => {"
             "  const hasFletchRender = !!document.querySelector(\"[id^='fletch-render']\");"
-            "  const hasAnchors = ['#image-anchor','#header','#visurl']"
-            "    .some((s) => !!document.querySelector(s));"
+            "  const hasAnchors = " + _FLETCH_ANCHORS_JS + ".some((s) => !!document.querySelector(s));"
             "  const selInner = "
             "    \"iframe[id^='google_ad_'], iframe[name^='google_ads_iframe_'], \" + "
             "    \"iframe[src*='discover_ads'], iframe[src*='googleads']\";"
@@ -1460,13 +1689,42 @@ async def extract_click_urls_from_discover_page(page: Page, *, bound_img_src: st
                 try { const a = document.createElement('a'); a.href = url; return a.href; } catch { return url; }
               };
 
+              // Unwrap redirector adurl targets and drop infra hosts here so only
+              // destination candidates cross back to Python.
+              const infraHosts = ['google.com', 'googleadservices.com', 'doubleclick.net',
+                                  'tpc.googlesyndication.com', 'pagead2.googlesyndication.com'];
+              const isInfra = (host) => infraHosts.some(h => host.endsWith(h));
+              const clean = (urls) => {
+                const kept = new Set();
+                for (let href of urls) {
+                  let u;
+                  try { u = new URL(href, location.href); } catch { continue; }
+                  const host = u.hostname.toLowerCase();
+                  if (host.endsWith('googleadservices.com') ||
+                      (host.endsWith('googleads.g.doubleclick.net') && u.pathname.toLowerCase().includes('pagead/conversion'))) {
+                    href = u.searchParams.get('adurl');
+                    if (!href) continue;
+                    try { u = new URL(href); } catch { continue; }
+                  }
+                  if (isInfra(u.hostname.toLowerCase())) continue;
+                  kept.add(href);  // keep the string as written; Python normalizes it
+                }
+                return Array.from(kept);
+              };
+
               const anchors = Array.from(container.querySelectorAll('a[href]'));
-              const wellKnown = ['#image-anchor', '#header', '#visurl']
+              const wellKnown = """
+            + _FLETCH_ANCHORS_JS
+            + """
                 .map(sel => { const a = container.querySelector(sel); return a && a.getAttribute('href'); })
                 .filter(Boolean);
+              // Single insertion-ordered result set; overlay matches go in ahead of the well-known anchors.
+              const hrefs = new Set();
+              const addWellKnown = () => { for (const h of wellKnown) hrefs.add(getAbs(h)); };
 
               if (!boundSrc) {
-                return { hrefs: Array.from(new Set(wellKnown.map(getAbs))), why: 'no_bound_src' };
+                addWellKnown();
+                return { hrefs: clean(hrefs), why: 'no_bound_src' };
               }
 
               const imgs = Array.from(container.querySelectorAll('img'));
@@ -1485,12 +1743,15 @@ async def extract_click_urls_from_discover_page(page: Page, *, bound_img_src: st
               };
 
               const target = imgs.find(img => matchImg(boundSrc, img.getAttribute('src') || '')) || null;
-              if (!target) return { hrefs: Array.from(new Set(wellKnown.map(getAbs))), why: 'no_target_img' };
+              if (!target) {
+                addWellKnown();
+                return { hrefs: clean(hrefs), why: 'no_target_img' };
+              }
 
               const rImg = target.getBoundingClientRect();
               const imgArea = Math.max(1, (rImg.width || 0) * (rImg.height || 0));
+              const imgL = rImg.left, imgR = rImg.right, imgT = rImg.top, imgB = rImg.bottom;
 
-              const hrefs = new Set();
               for (const a of anchors) {
                 const href = a.getAttribute('href');
                 if (!href) continue;
@@ -1499,19 +1760,17 @@ async def extract_click_urls_from_discover_page(page: Page, *, bound_img_src: st
                 // Rule (b): overlay intersection >= 0.6 of image area
                 try {
                   const rA = a.getBoundingClientRect();
-                  const ix = Math.max(0, Math.min(rImg.right, rA.right) - Math.max(rImg.left, rA.left));
-                  const iy = Math.max(0, Math.min(rImg.bottom, rA.bottom) - Math.max(rImg.top, rA.top));
-                  const inter = ix * iy;
-                  if (inter / imgArea >= 0.6) { hrefs.add(getAbs(href)); continue; }
+                  const ix = (imgR < rA.right ? imgR : rA.right) - (imgL > rA.left ? imgL : rA.left);
+                  if (ix <= 0) continue;
+                  const iy = (imgB < rA.bottom ? imgB : rA.bottom) - (imgT > rA.top ? imgT : rA.top);
+                  if (iy <= 0) continue;
+                  if ((ix * iy) / imgArea >= 0.6) { hrefs.add(getAbs(href)); continue; }
                 } catch {}
               }
 
               // Always consider well-known IDs as a last resort
-              for (const w of wellKnown) {
-                const el = container.querySelector(w);
-                if (el) { const h = el.getAttribute('href'); if (h) hrefs.add(getAbs(h)); }
-              }
-              return { hrefs: Array.from(hrefs), why: 'bound_src' };
+              addWellKnown();
+              return { hrefs: clean(hrefs), why: 'bound_src' };
             }
             """,
             bound_img_src or None,
@@ -1521,31 +1780,15 @@ async def extract_click_urls_from_discover_page(page: Page, *, bound_img_src: st
 
     raw_hrefs = result.get("hrefs", []) if isinstance(result, dict) else []
 
-    # 2) Normalize and filter infra/redirector hosts
-    out: list[str] = []
+    # 2) Safety net: the page already unwrapped redirectors and dropped infra hosts, but
+    # normalize (tracker params) and re-check hosts here as well.
+    out: dict[str, None] = {}  # insertion-ordered set
     for href in raw_hrefs:
-        try:
-            norm = normalize_click_url(href)
-            if not norm:
-                continue
-            parsed = urllib.parse.urlparse(norm)
-            host = (parsed.netloc or "").lower()
-            # Filter infra/non-destination hosts
-            if host.endswith("google.com") and not host.endswith("googleadservices.com"):
-                continue
-            if host.endswith("googleadservices.com"):
-                # normalize_click_url should have unwrapped adurl already; if not, skip
-                continue
-            if host.endswith("doubleclick.net") or host.endswith("g.doubleclick.net"):
-                continue
-            if host.endswith("tpc.googlesyndication.com") or host.endswith("pagead2.googlesyndication.com"):
-                continue
-            if norm not in out:
-                out.append(norm)
-        except Exception:
-            continue
+        norm = _destination_click_url(href)
+        if norm:
+            out[norm] = None
 
-    return out
+    return list(out)
 
 
 # ============================
@@ -1589,95 +1832,426 @@ async def find_plain_image_variants(page: Page) -> list[str]:
         return []
 
 
+# Enumerates the (up to three) carousel tiles in one round-trip: unhide each tile, then
+# classify it by the first of iframe / img / fletch-renderer it contains. Layouts without
+# the carousel wrapper fall back to bare sub-containers, then to stand-alone fletch.
+_CAROUSEL_VARIANTS_JS = """
+() => {
+    let tiles = document.querySelectorAll('div.creative-container.creative-carousel > div.creative-sub-container');
+    if (!tiles.length) tiles = document.querySelectorAll('div.creative-container .creative-sub-container');
+    const out = Array.from(tiles).slice(0, 3).map((tile, i) => {
+        const v = {idx: i + 1, dom_index: i + 2, kind: 'skip', src: ''};
+        try { tile.hidden = false; tile.classList && tile.classList.remove('hidden'); } catch {}
+        const iframe = tile.querySelector(
+            'creative > div > div > html-renderer > div > iframe, '
+            + 'creative > div > html-renderer > div > iframe, '
+            + 'creative html-renderer iframe');
+        if (iframe) return {...v, kind: 'iframe', src: iframe.getAttribute('src') || ''};
+        const img = tile.querySelector(
+            'creative > div > div > html-renderer > div > img, '
+            + 'creative > div > html-renderer > div > img, '
+            + 'creative html-renderer img');
+        if (img) return {...v, kind: 'img', src: img.getAttribute('src') || ''};
+        const fletch = tile.querySelector(
+            'fletch-renderer, creative fletch-renderer, creative > div fletch-renderer, '
+            + 'creative > div > div > fletch-renderer');
+        if (fletch) return {...v, kind: 'fletch'};
+        return v;  // tile exists but has neither iframe nor img; keep ordering, mark skippable
+    });
+    if (out.length) return out;
+    // Stand-alone FLETCH creatives without carousel wrappers
+    return Array.from(document.querySelectorAll('div.creative-container fletch-renderer'))
+        .map((_, i) => ({idx: i + 1, dom_index: 0, kind: 'fletch', src: ''}));
+}
+"""
+
+
 async def enumerate_gatc_carousel_variants(page: Page) -> list[dict]:
     """
     Strict GATC carousel enumerator.
     Returns a list of dicts with:
       - idx        : 1-based variant index (v1..v3)
       - dom_index  : 2..4 (the nth-child inside the carousel)
-      - kind       : 'img' | 'iframe' | 'skip'  (never 'unknown')
+      - kind       : 'img' | 'iframe' | 'fletch' | 'skip'  (never 'unknown')
       - src        : the iframe/img src (may be relative)
-    We only consider the three creative tiles that GATC uses.
+    We only consider the three creative tiles that GATC uses; all tiles are classified in one evaluate.
     """
-    tiles = await page.query_selector_all("div.creative-container.creative-carousel > div.creative-sub-container")
-    if not tiles:
-        # Some layouts drop the creative-carousel wrapper and only emit creative-sub-container-si.
-        tiles = await page.query_selector_all("div.creative-container .creative-sub-container")
-    out: list[dict] = []
-    for i, tile in enumerate(tiles[:3], start=1):
-        dom_index = i + 1  # v1->2, v2->3, v3->4
-
-        # Make sure hidden class doesn't block content discovery
-        try:
-            await tile.evaluate("(el)=>{ el.hidden=false; el.classList && el.classList.remove('hidden'); }")
-        except Exception:
-            pass
+    return list(await page.evaluate(_CAROUSEL_VARIANTS_JS) or [])
 
-        iframe = await tile.query_selector(
-            "creative > div > div > html-renderer > div > iframe, "
-            "creative > div > html-renderer > div > iframe, "
-            "creative html-renderer iframe"
-        )
+
+_SINGLE_IFRAME_SELECTOR = ", ".join(
+    (
+        "creative-details html-renderer iframe",
+        ".creative-details-container creative html-renderer iframe",
+        "creative html-renderer iframe",
+        "div.creative-container html-renderer iframe",
+        "div.creative-container iframe",
+    )
+)
+
+
+async def find_single_iframe_variant(page: Page) -> list[dict]:
+    """
+    Detect a single creative rendered as an <iframe> (no carousel).
+    Returns [{idx:1, dom_index:0, kind:'iframe', src:<string or ''>}] or [].
+    """
+    # One wait over the selector list: the first visible match wins and a miss costs one
+    # timeout instead of one per selector.
+    try:
+        iframe = await page.wait_for_selector(_SINGLE_IFRAME_SELECTOR, timeout=4000)
         if iframe:
             src = (await iframe.get_attribute("src")) or ""
-            out.append({"idx": i, "dom_index": dom_index, "kind": "iframe", "src": src})
-            continue
+            return [{"idx": 1, "dom_index": 0, "kind": "iframe", "src": src}]
+    except Exception:
+        pass
+    return []
 
-        img = await tile.query_selector(
-            "creative > div > div > html-renderer > div > img, " "creative > div > html-renderer > div > img, " "creative html-renderer img"
-        )
-        if img:
-            src = (await img.get_attribute("src")) or ""
-            out.append({"idx": i, "dom_index": dom_index, "kind": "img", "src": src})
-            continue
 
-        fletch = await tile.query_selector(
-            "fletch-renderer, creative fletch-renderer, creative > div fletch-renderer, creative > div > div > fletch-renderer"
-        )
-        if fletch:
-            out.append({"idx": i, "dom_index": dom_index, "kind": "fletch", "src": ""})
-            continue
+# Carousel enumeration plus an already-visible single iframe, in one round-trip; the
+# single-iframe result lets the cascade skip find_single_iframe_variant's wait.
+_DETECT_VARIANTS_JS = (
+    """
+(singleSel) => {
+    const carousel = ("""
+    + _CAROUSEL_VARIANTS_JS
+    + """)();
+    if (carousel.length) return {carousel, single_iframe: []};
+    for (const el of document.querySelectorAll(singleSel)) {
+        const r = el.getBoundingClientRect();
+        if (r.width > 0 && r.height > 0 && getComputedStyle(el).visibility !== 'hidden') {
+            return {carousel: [], single_iframe: [{idx: 1, dom_index: 0, kind: 'iframe', src: el.getAttribute('src') || ''}]};
+        }
+    }
+    return {carousel: [], single_iframe: []};
+}
+"""
+)
+
+
+async def detect_creative_variants(page: Page) -> dict[str, list[dict]]:
+    """
+    Run the first two detection steps in one evaluate.
+    Returns {"carousel": <enumerate_gatc_carousel_variants result>, "single_iframe": <[variant] or []>};
+    an empty single_iframe only means no iframe was visible yet, so callers still wait for one.
+    """
+    detected = await page.evaluate(_DETECT_VARIANTS_JS, _SINGLE_IFRAME_SELECTOR) or {}
+    return {"carousel": list(detected.get("carousel") or []), "single_iframe": list(detected.get("single_iframe") or [])}
 
-        # Tile exists but has neither iframe nor img — preserve ordering but mark as skippable.
-        out.append({"idx": i, "dom_index": dom_index, "kind": "skip", "src": ""})
 
-    if out:
-        return out
+# ============================
+# Core ad processing
+# ============================
 
-    # Stand-alone FLETCH creatives without carousel wrappers
-    lone_fletch = await page.query_selector_all("div.creative-container fletch-renderer")
-    if lone_fletch:
-        return [{"idx": i, "dom_index": 0, "kind": "fletch", "src": ""} for i, _ in enumerate(lone_fletch, start=1)]
 
-    return out
+# Does this document hold the creative DOM, and if not, which child iframe might? One round-trip.
+_CREATIVE_DOC_PROBE_JS = """
+() => {
+    if (document.querySelector('#mys-content, #google_image_div, gwd-google-ad, gwd-page, #page1, .gwd-page-content, svg.image')) {
+        return { hasCreative: true, nestedSrc: null };
+    }
+    const fr = document.querySelector('iframe[src]');
+    return { hasCreative: false, nestedSrc: fr && fr.getAttribute('src') };
+}
+"""
 
 
-async def find_single_iframe_variant(page: Page) -> list[dict]:
+# Scroll the creative container into view and return its document-space box (for a
+# full_page clip), or null when the document has no known container.
+_CENTER_CREATIVE_CONTAINER_JS = """
+() => {
+    const el = document.querySelector('#mys-content, #google_image_div');
+    if (!el) return null;
+    el.scrollIntoView({block: 'center', inline: 'center'});
+    const r = el.getBoundingClientRect();
+    return { x: r.left + window.scrollX, y: r.top + window.scrollY, width: r.width, height: r.height };
+}
+"""
+
+
+async def _abort_route(route) -> None:
+    try:
+        await route.abort()
+    except Exception:
+        pass
+
+
+async def _capture_iframe_variant(
+    context,
+    *,
+    con,
+    storage_client: storage.Client,
+    bucket_name: str,
+    http: requests.Session,
+    args: CliArgs,
+    t: Timeouts,
+    ad_id: str,
+    ad_url: str,
+    adv: str,
+    variant_id: str,
+    src_abs: str,
+    dry_run: bool,
+) -> bool:
     """
-    Detect a single creative rendered as an <iframe> (no carousel).
-    Returns [{idx:1, dom_index:0, kind:'iframe', src:<string or ''>}] or [].
+    Render one sadbundle/iframe variant on its own page and persist the capture.
+
+    Tries raw image bytes, then a DOM screenshot, then a full-page screenshot.
+    Returns True once one of them was stored.
     """
-    selectors = [
-        "creative-details html-renderer iframe",
-        ".creative-details-container creative html-renderer iframe",
-        "creative html-renderer iframe",
-        "div.creative-container html-renderer iframe",
-        "div.creative-container iframe",
-    ]
-    for sel in selectors:
+    # An iframe pointed straight at an image file needs no page: download it and skip
+    # the new_page/goto cost. Anything that doesn't come back as an image is rendered.
+    if urllib.parse.urlsplit(src_abs).path.lower().endswith(_IMAGE_URL_SUFFIXES):
         try:
-            iframe = await page.wait_for_selector(sel, timeout=4000)
-            if iframe:
-                src = (await iframe.get_attribute("src")) or ""
-                return [{"idx": 1, "dom_index": 0, "kind": "iframe", "src": src}]
+            resp = await asyncio.to_thread(http.get, src_abs, timeout=20)
+            resp.raise_for_status()
+            is_image = resp.headers.get("Content-Type", "").lower().startswith("image/")
         except Exception:
-            continue
-    return []
+            is_image = False
+        if is_image:
+            if await _finalize_capture(
+                con,
+                storage_client,
+                bucket_name,
+                adv,
+                ad_id,
+                "sadbundle",
+                resp.content,
+                dry_run,
+                source_url=ad_url,
+                variant_id=variant_id,
+                click_url=None,
+                capture_method=CAPTURE_METHOD_IMG,
+                capture_target="iframe_src_img",
+            ):
+                return True
 
+    iframe_page = await context.new_page()
+    try:
+        # Only tracker URLs are routed (and aborted); everything else never leaves the browser.
+        await iframe_page.route(_TRACKER_URL_RE, _abort_route)
+        await iframe_page.goto(
+            src_abs,
+            wait_until="domcontentloaded",
+            timeout=t.page_ms,
+        )
+        # Optional: dump inner iframe HTML for debugging
+        if args and args.debug_html:
+            try:
+                await ensure_debug_html(iframe_page, f"{ad_id}_{variant_id}")
+            except Exception:
+                pass
 
-# ============================
-# Core ad processing
-# ============================
+        # If the creative DOM isn't in this document, hop one level down if there's a child iframe.
+        try:
+            probe = await iframe_page.evaluate(_CREATIVE_DOC_PROBE_JS)
+        except Exception:
+            probe = None
+        if not (probe or {}).get("hasCreative"):
+            nested_src = (probe or {}).get("nestedSrc")
+            if nested_src:
+                try:
+                    await iframe_page.goto(
+                        urllib.parse.urljoin(iframe_page.url, nested_src),
+                        wait_until="domcontentloaded",
+                        timeout=t.page_ms,
+                    )
+                except Exception:
+                    pass
+
+        # FLETCH inside inner iframe: intentionally ignored here; the host-page branch handles FLETCH
+        # Fall through to SADBUNDLE/GWD logic below.
+        # 1) Try raw image bytes first (pure image SADBUNDLE case)
+        img_bytes = await fetch_sadbundle_image_bytes(
+            iframe_page,
+            frame_url=iframe_page.url,
+            http=http,
+            iframe_timeout_ms=t.iframe_ms,
+        )
+        if img_bytes:
+            try:
+                clicks = await extract_click_urls_from_frame(iframe_page)
+            except Exception:
+                clicks = []
+            norm_click = await _persist_primary_click(con, adv, ad_id, variant_id, "sadbundle", clicks, dry_run=dry_run)
+            if await _finalize_capture(
+                con,
+                storage_client,
+                bucket_name,
+                adv,
+                ad_id,
+                "sadbundle",
+                img_bytes,
+                dry_run,
+                source_url=ad_url,
+                variant_id=variant_id,
+                click_url=norm_click,
+                capture_method=CAPTURE_METHOD_IMG,
+                capture_target="sadbundle_img",
+            ):
+                return True
+
+        # 2) DOM screenshot path (GWD or templated DOM)
+        gwd = await sniff_gwd(iframe_page, t.iframe_ms)
+
+        png, sel = await screenshot_sadbundle_element(
+            iframe_page,
+            t.iframe_ms,
+            preferred_selectors=None,  # '#mys-content' et al. covered internally
+        )
+
+        try:
+            clicks = await extract_click_urls_from_frame(iframe_page)
+        except Exception:
+            clicks = []
+        norm_click = await _persist_primary_click(con, adv, ad_id, variant_id, "sadbundle", clicks, dry_run=dry_run)
+
+        if png:
+            cap_target = sel or "sad_dom"
+            if gwd.get("is_gwd"):
+                cap_target = f"{cap_target}[gwd:{gwd.get('marker')}]"
+            if await _finalize_capture(
+                con,
+                storage_client,
+                bucket_name,
+                adv,
+                ad_id,
+                "sadbundle",
+                png,
+                dry_run,
+                source_url=ad_url,
+                variant_id=variant_id,
+                click_url=norm_click,
+                capture_method=CAPTURE_METHOD_SCREENSHOT,
+                capture_target=cap_target,
+            ):
+                return True
+
+        # 3) Last-ditch fallback: full-page screenshot of the iframe document
+        png_generic = None
+        try:
+            # Center a likely container if present and clip the capture to it; the whole
+            # document is mostly empty space around a 300x250-style creative.
+            try:
+                clip = await iframe_page.evaluate(_CENTER_CREATIVE_CONTAINER_JS)
+            except Exception:
+                clip = None
+            if not (clip and clip["width"] >= FALLBACK_CLIP_MIN_PX and clip["height"] >= FALLBACK_CLIP_MIN_PX):
+                clip = None
+            png_generic = await _quiescent_or_settled_screenshot(
+                iframe_page,
+                lambda: _png_screenshot(iframe_page, full_page=True, clip=clip),
+                quiescent_timeout_ms=800,
+                max_wait_ms=8000,
+                min_stable_ms=1200,
+                interval_ms=250,
+                near_epsilon=3,
+                min_observe_ms=800,
+            )
+        except Exception:
+            png_generic = None
+
+        if png_generic:
+            try:
+                jlog(
+                    "info",
+                    event="sadbundle_fullpage_fallback",
+                    ad_id=ad_id,
+                    advertiser_id=str(adv),
+                    variant_id=variant_id,
+                    clipped=clip is not None,
+                )
+            except Exception:
+                pass
+            if await _finalize_capture(
+                con,
+                storage_client,
+                bucket_name,
+                adv,
+                ad_id,
+                "sadbundle",
+                png_generic,
+                dry_run,
+                source_url=ad_url,
+                variant_id=variant_id,
+                click_url=None,
+                capture_method=CAPTURE_METHOD_SCREENSHOT,
+                capture_target="sad_fullpage",
+            ):
+                return True
+        return False
+    finally:
+        await iframe_page.close()
+
+
+async def _capture_host_iframe_fallback(
+    page: Page,
+    *,
+    con,
+    storage_client: storage.Client,
+    bucket_name: str,
+    ad_id: str,
+    ad_url: str,
+    adv: str,
+    variant_id: str,
+    dom_index: int,
+    dry_run: bool,
+) -> bool:
+    """Screenshot the carousel child on the host page when its iframe page yielded nothing."""
+    if dom_index <= 0:
+        return False
+    try:
+        sel_variant = f".creative-container.creative-carousel > div:nth-child({dom_index})"
+        # Prefer the child's iframe if present; otherwise the child itself.
+        fe = await page.query_selector(f"{sel_variant} iframe") or await page.query_selector(sel_variant)
+        if fe:
+            try:
+                await fe.scroll_into_view_if_needed()
+            except Exception:
+                pass
+            try:
+                await page.evaluate(
+                    "(el) => { "
+                    "  let p = el; "
+                    "  while (p) { "
+                    "    try { "
+                    "      const s = p.style; "
+                    "      s.overflow = 'visible'; "
+                    "      s.clipPath = 'none'; "
+                    "      s.webkitClipPath = 'none'; "
+                    "      s.mask = 'none'; "
+                    "      s.webkitMask = 'none'; "
+                    "      s.maxHeight = 'none'; "
+                    "      s.maxWidth = 'none'; "
+                    "    } catch(_) {} "
+                    "    p = p.parentElement; "
+                    "  } "
+                    "}",
+                    fe,
+                )
+            except Exception:
+                pass
+            png = await stabilized_host_iframe_screenshot(fe)
+        else:
+            png = None
+    except Exception:
+        png = None
+
+    if not png:
+        return False
+    return await _finalize_capture(
+        con,
+        storage_client,
+        bucket_name,
+        adv,
+        ad_id,
+        "sadbundle",
+        png,
+        dry_run,
+        source_url=ad_url,
+        variant_id=variant_id,
+        click_url=None,
+        capture_method=CAPTURE_METHOD_SCREENSHOT,
+        capture_target="host_iframe",
+    )
 
 
 async def _process_with_browser(
@@ -1694,6 +2268,7 @@ async def _process_with_browser(
     dry_run: bool,
     trace: bool,
     args: CliArgs | None,
+    warm_context: _WarmContext | None = None,
 ) -> str:
     if args is None:
         raise ValueError("CliArgs must be provided to _process_with_browser")
@@ -1709,18 +2284,68 @@ async def _process_with_browser(
     )
 
     context = None
+    pending_iframes: list[tuple[asyncio.Task[bool], int, str]] = []
+    iframe_slots = asyncio.Semaphore(IFRAME_VARIANT_CONCURRENCY)
+
+    async def _bounded(capture) -> bool:
+        try:
+            async with iframe_slots:
+                return await capture
+        finally:
+            capture.close()  # no-op once awaited; discards a capture cancelled while still queued
+
+    # With --all-variants, a variant's normalize/OCR/upload runs in the background while the
+    # next variant is captured; outcomes are collected by _drain_finalizing.
+    defer_finalize = not _stop_after_first(args)
+    finalizing: list[tuple[asyncio.Task[bool], str, str]] = []
+
+    async def _finalize_or_defer(finalize, variant_id: str, error_prefix: str) -> bool:
+        """Await a _finalize_capture coroutine, or queue it; True only if it was stored here."""
+        if defer_finalize:
+            finalizing.append((asyncio.create_task(finalize), variant_id, error_prefix))
+            return False
+        if await finalize:
+            return True
+        # Fetched <img> and FLETCH captures have no fallback strategy; close the variant out.
+        record_error(con, adv, ad_id, "asset_too_small", variant_id=variant_id, dry_run=dry_run)
+        return False
+
+    async def _drain_finalizing() -> bool:
+        """Wait for queued finalizes, record failures, and report whether any was stored."""
+        batch = finalizing[:]
+        finalizing.clear()
+        results = await asyncio.gather(*(task for task, _, _ in batch), return_exceptions=True)
+        stored = False
+        for (_, variant_id, error_prefix), result in zip(batch, results):
+            if isinstance(result, BaseException):
+                record_error(con, adv, ad_id, f"{error_prefix}: {result}", variant_id=variant_id, dry_run=dry_run)
+            elif result:
+                stored = True
+            else:
+                record_error(con, adv, ad_id, "asset_too_small", variant_id=variant_id, dry_run=dry_run)
+        return stored
+
     try:
         if hasattr(active_browser, "is_connected") and not active_browser.is_connected():
             raise BrowserRestartRequired("browser disconnected")
         try:
-            context = await active_browser.new_context(
-                user_agent=user_agent,
-                device_scale_factor=(args.device_scale_factor if args is not None else DEFAULT_DEVICE_SCALE_FACTOR),
-            )
+            if warm_context is not None:
+                context = await warm_context.acquire(
+                    active_browser,
+                    user_agent=user_agent,
+                    device_scale_factor=args.device_scale_factor,
+                )
+            else:
+                context = await active_browser.new_context(
+                    user_agent=user_agent,
+                    device_scale_factor=(args.device_scale_factor if args is not None else DEFAULT_DEVICE_SCALE_FACTOR),
+                )
         except PlaywrightError as exc:
             raise BrowserRestartRequired(str(exc)) from exc
         t = _timeouts(args)
         context.set_default_timeout(t.page_ms)
+        if args.debug_frames:
+            await install_frame_inventory(context)
         if trace:
             await context.tracing.start(screenshots=True, snapshots=True, sources=True)
 
@@ -1759,9 +2384,10 @@ async def _process_with_browser(
         captured_any = False
 
         # --- Capture path: first try carousel, then single-iframe, then plain <img> ---
-        variants = await enumerate_gatc_carousel_variants(page)
+        detected = await detect_creative_variants(page)
+        variants = detected["carousel"]
 
-        if args is not None and getattr(args, "debug_frames", False):
+        if args is not None and args.debug_frames:
             try:
                 jlog("info", event="carousel_variants", ad_id=ad_id, advertiser_id=str(adv), variants=variants)
             except Exception:
@@ -1769,7 +2395,7 @@ async def _process_with_browser(
 
         # If no carousel, try single <iframe> creative
         if not variants:
-            single_ifr = await find_single_iframe_variant(page)
+            single_ifr = detected["single_iframe"] or await find_single_iframe_variant(page)
             if single_ifr:
                 variants = single_ifr
 
@@ -1801,14 +2427,14 @@ async def _process_with_browser(
                     upsert_pending(con, ad_id, adv, variant_id=variant_id, source_url=ad_url, dry_run=dry_run)
                     adlog("variant_attempt", ad_id=ad_id, advertiser_id=adv, url=ad_url, render_method="img", variant_id=variant_id)
                     try:
-                        resp = http.get(src, timeout=20)
+                        resp = await asyncio.to_thread(http.get, src, timeout=20)
                         resp.raise_for_status()
                         try:
                             clicks = await extract_click_urls_from_discover_page(page, bound_img_src=src)
                         except Exception:
                             clicks = []
                         norm_click = await _persist_primary_click(con, adv, ad_id, variant_id, "img", clicks, dry_run=dry_run)
-                        await _finalize_capture(
+                        finalize = _finalize_capture(
                             con,
                             storage_client,
                             bucket_name,
@@ -1823,11 +2449,14 @@ async def _process_with_browser(
                             capture_method=CAPTURE_METHOD_IMG,
                             capture_target="img[src]",
                         )
-                        captured_any = True
-                        if _stop_after_first(args):
-                            return "done"
+                        if await _finalize_or_defer(finalize, variant_id, "plain_img_fetch_error"):
+                            captured_any = True
+                            if _stop_after_first(args):
+                                return "done"
                     except Exception as e:
                         record_error(con, adv, ad_id, f"plain_img_fetch_error: {e}", variant_id=variant_id, dry_run=dry_run)
+            if finalizing and await _drain_finalizing():
+                captured_any = True
             if not captured_any:
                 err = await wait_policy_or_errors(page)
                 if err in {"removed_for_policy_violation", "rate_limited_429", "not_found", "variation_unavailable"}:
@@ -1871,37 +2500,16 @@ async def _process_with_browser(
                 )
 
                 # Scope to the carousel tile if present
-                selector_prefixes = _tile_selector_candidates(dom_index, vidx) if dom_index > 0 else []
-                sel_variant = ""
-                for candidate in selector_prefixes:
-                    if not candidate:
-                        continue
-                    try:
-                        handle = await page.query_selector(candidate)
-                    except Exception:
-                        handle = None
-                    if handle:
-                        sel_variant = candidate
-                        try:
-                            await handle.dispose()
-                        except Exception:
-                            pass
-                        break
-                if not sel_variant and selector_prefixes:
-                    sel_variant = selector_prefixes[0]
-
-                # Make the tile visible/active and unhide it if needed
-                if sel_variant:
+                selector_prefixes = _tile_selector_candidates(dom_index, vidx) if dom_index > 0 else ()
+                sel_variant = selector_prefixes[0] if selector_prefixes else ""
+                if selector_prefixes:
+                    # Find the tile, scroll it into view and unhide it in the same round-trip
                     try:
-                        await page.evaluate(
-                            "(sel) => { const el = document.querySelector(sel); if (el) {"
-                            "  el.scrollIntoView({block:'center'});"
-                            "  el.classList?.remove('hidden'); el.removeAttribute('hidden');"
-                            "} }",
-                            sel_variant,
-                        )
+                        first = await page.evaluate(_REVEAL_FIRST_MATCHING_TILE_JS, list(selector_prefixes))
                     except Exception:
-                        pass
+                        first = -1
+                    if first >= 0:
+                        sel_variant = selector_prefixes[first]
 
                 # Locate the FLETCH container on the host page
                 fe = None
@@ -1919,13 +2527,16 @@ async def _process_with_browser(
                     if fallback not in seen:
                         root_selector_candidates.append(fallback)
                         seen.add(fallback)
-                for candidate in root_selector_candidates:
+                # Resolve the first present candidate in one evaluate, then fetch just that handle.
+                try:
+                    first = await page.evaluate(_FIRST_MATCHING_SELECTOR_JS, root_selector_candidates)
+                except Exception:
+                    first = -1
+                if first >= 0:
                     try:
-                        fe = await page.query_selector(candidate)
+                        fe = await page.query_selector(root_selector_candidates[first])
                     except Exception:
                         fe = None
-                    if fe:
-                        break
 
                 # If policy banner is now visible, treat as removed
                 try:
@@ -1971,7 +2582,7 @@ async def _process_with_browser(
                         await _unclip_and_center_element(fe)
                         loc = fe.locator(":scope")
                         png_f = await _settle_screenshot(
-                            lambda: loc.screenshot(type="png"),
+                            lambda: _png_screenshot(loc),
                             max_wait_ms=FLETCH_SETTLE_MAX_MS,
                             min_stable_ms=FLETCH_SETTLE_MIN_STABLE_MS,
                             interval_ms=DEFAULT_SETTLE_INTERVAL_MS,
@@ -1980,7 +2591,7 @@ async def _process_with_browser(
                         )
                     except Exception:
                         try:
-                            png_f = await fe.screenshot(type="png")
+                            png_f = await _png_screenshot(fe)
                         except Exception:
                             png_f = None
 
@@ -2012,7 +2623,7 @@ async def _process_with_browser(
                 norm_click_f = await _persist_primary_click(con, adv, ad_id, variant_id, "fletch", clicks_f, dry_run=dry_run)
 
                 if png_f:
-                    await _finalize_capture(
+                    finalize = _finalize_capture(
                         con,
                         storage_client,
                         bucket_name,
@@ -2027,9 +2638,10 @@ async def _process_with_browser(
                         capture_method=CAPTURE_METHOD_SCREENSHOT,
                         capture_target=("fletch_tile" if dom_index > 0 else "fletch_host"),
                     )
-                    captured_any = True
-                    if _stop_after_first(args):
-                        return "done"
+                    if await _finalize_or_defer(finalize, variant_id, "fletch_finalize_error"):
+                        captured_any = True
+                        if _stop_after_first(args):
+                            return "done"
                     continue
 
             adlog(
@@ -2044,14 +2656,14 @@ async def _process_with_browser(
             # --- Direct <img> path
             if kind == "img" and src_abs:
                 try:
-                    resp = http.get(src_abs, timeout=20)
+                    resp = await asyncio.to_thread(http.get, src_abs, timeout=20)
                     resp.raise_for_status()
                     try:
                         clicks = await extract_click_urls_from_discover_page(page, bound_img_src=src_abs)
                     except Exception:
                         clicks = []
                     norm_click = await _persist_primary_click(con, adv, ad_id, variant_id, "img", clicks, dry_run=dry_run)
-                    await _finalize_capture(
+                    finalize = _finalize_capture(
                         con,
                         storage_client,
                         bucket_name,
@@ -2066,9 +2678,10 @@ async def _process_with_browser(
                         capture_method=CAPTURE_METHOD_IMG,
                         capture_target="img[src]",
                     )
-                    captured_any = True
-                    if _stop_after_first(args):
-                        return "done"
+                    if await _finalize_or_defer(finalize, variant_id, "img_variant_fetch_error"):
+                        captured_any = True
+                        if _stop_after_first(args):
+                            return "done"
                     continue
                 except Exception as e:
                     record_error(con, adv, ad_id, f"img_variant_fetch_error: {e}", variant_id=variant_id, dry_run=dry_run)
@@ -2086,246 +2699,61 @@ async def _process_with_browser(
             if kind in ("sadbundle", "iframe") and not _is_meaningful_src(src_abs):
                 src_abs = ""
 
-            if kind in ("sadbundle", "iframe"):
-                if src_abs:
-                    iframe_page = await context.new_page()
-                    captured_variant = False
-                    try:
-                        await iframe_page.goto(
-                            src_abs,
-                            wait_until="domcontentloaded",
-                            timeout=t.page_ms,
-                        )
-                        # Optional: dump inner iframe HTML for debugging
-                        if args and getattr(args, "debug_html", False):
-                            try:
-                                await ensure_debug_html(iframe_page, f"{ad_id}_{variant_id}")
-                            except Exception:
-                                pass
-
-                        # If the creative DOM isn't in this document, hop one level down if there's a child iframe.
-                        try:
-                            has_creative = await iframe_page.evaluate(
-                                "() => !!document.querySelector("
-                                "'#mys-content, #google_image_div, gwd-google-ad, gwd-page, "
-                                "#page1, .gwd-page-content, svg.image'"
-                                ")"
-                            )
-                        except Exception:
-                            has_creative = False
-
-                        if not has_creative:
-                            try:
-                                nested_src = await iframe_page.evaluate(
-                                    "() => { const fr = document.querySelector('iframe[src]'); " "return fr && fr.getAttribute('src'); }"
-                                )
-                            except Exception:
-                                nested_src = None
-
-                            if nested_src:
-                                try:
-                                    await iframe_page.goto(
-                                        urllib.parse.urljoin(iframe_page.url, nested_src),
-                                        wait_until="domcontentloaded",
-                                        timeout=t.page_ms,
-                                    )
-                                except Exception:
-                                    pass
-
-                        # FLETCH inside inner iframe: intentionally ignored here; the host-page branch handles FLETCH
-                        # Fall through to SADBUNDLE/GWD logic below.
-                        # 1) Try raw image bytes first (pure image SADBUNDLE case)
-                        img_bytes = await fetch_sadbundle_image_bytes(
-                            iframe_page,
-                            frame_url=iframe_page.url,
-                            http=http,
-                            iframe_timeout_ms=t.iframe_ms,
-                        )
-                        if img_bytes:
-                            try:
-                                clicks = await extract_click_urls_from_frame(iframe_page)
-                            except Exception:
-                                clicks = []
-                            norm_click = await _persist_primary_click(con, adv, ad_id, variant_id, "sadbundle", clicks, dry_run=dry_run)
-                            await _finalize_capture(
-                                con,
-                                storage_client,
-                                bucket_name,
-                                adv,
-                                ad_id,
-                                "sadbundle",
-                                img_bytes,
-                                dry_run,
-                                source_url=ad_url,
-                                variant_id=variant_id,
-                                click_url=norm_click,
-                                capture_method=CAPTURE_METHOD_IMG,
-                                capture_target="sadbundle_img",
-                            )
-                            captured_any = True
-                            captured_variant = True
-                            if _stop_after_first(args):
-                                return "done"
-
-                        # 2) DOM screenshot path (GWD or templated DOM)
-                        if not captured_variant:
-                            gwd = await sniff_gwd(iframe_page, t.iframe_ms)
-
-                            png, sel = await screenshot_sadbundle_element(
-                                iframe_page,
-                                t.iframe_ms,
-                                preferred_selectors=None,  # '#mys-content' et al. covered internally
-                            )
-
-                            try:
-                                clicks = await extract_click_urls_from_frame(iframe_page)
-                            except Exception:
-                                clicks = []
-                            norm_click = await _persist_primary_click(con, adv, ad_id, variant_id, "sadbundle", clicks, dry_run=dry_run)
-
-                            if png:
-                                cap_target = sel or "sad_dom"
-                                if gwd.get("is_gwd"):
-                                    cap_target = f"{cap_target}[gwd:{gwd.get('marker')}]"
-                                await _finalize_capture(
-                                    con,
-                                    storage_client,
-                                    bucket_name,
-                                    adv,
-                                    ad_id,
-                                    "sadbundle",
-                                    png,
-                                    dry_run,
-                                    source_url=ad_url,
-                                    variant_id=variant_id,
-                                    click_url=norm_click,
-                                    capture_method=CAPTURE_METHOD_SCREENSHOT,
-                                    capture_target=cap_target,
-                                )
-                                captured_any = True
-                                captured_variant = True
-                                if _stop_after_first(args):
-                                    return "done"
-
-                        # 3) Last-ditch fallback: full-page screenshot of the iframe document
-                        if not captured_variant:
-                            png_generic = None
-                            try:
-                                # Try to center likely containers if present
-                                try:
-                                    await iframe_page.evaluate(
-                                        "() => { const el = document.querySelector('#mys-content, #google_image_div'); "
-                                        "if (el) { el.scrollIntoView({block:'center', inline:'center'}); } }"
-                                    )
-                                except Exception:
-                                    pass
-                                png_generic = await _settle_screenshot(
-                                    lambda: iframe_page.screenshot(type="png", full_page=True),
-                                    max_wait_ms=8000,
-                                    min_stable_ms=1200,
-                                    interval_ms=250,
-                                    near_epsilon=3,
-                                    min_observe_ms=800,
-                                )
-                            except Exception:
-                                png_generic = None
-
-                            if png_generic:
-                                try:
-                                    jlog(
-                                        "info",
-                                        event="sadbundle_fullpage_fallback",
-                                        ad_id=ad_id,
-                                        advertiser_id=str(adv),
-                                        variant_id=variant_id,
-                                    )
-                                except Exception:
-                                    pass
-                                await _finalize_capture(
-                                    con,
-                                    storage_client,
-                                    bucket_name,
-                                    adv,
-                                    ad_id,
-                                    "sadbundle",
-                                    png_generic,
-                                    dry_run,
-                                    source_url=ad_url,
-                                    variant_id=variant_id,
-                                    click_url=None,
-                                    capture_method=CAPTURE_METHOD_SCREENSHOT,
-                                    capture_target="sad_fullpage",
-                                )
-                                captured_any = True
-                                captured_variant = True
-                                if _stop_after_first(args):
-                                    return "done"
-                    finally:
-                        await iframe_page.close()
-
-                    # Only skip to the next variant if we actually captured something in this branch.
-                    if captured_variant:
-                        continue  # handled success; next variant
-
-                    # No URL even after activation: fall back to host element screenshot of that child.
-                    if dom_index > 0:
-                        try:
-                            sel_variant = f".creative-container.creative-carousel > div:nth-child({dom_index})"
-                            # Prefer the child's iframe if present; otherwise the child itself.
-                            fe = await page.query_selector(f"{sel_variant} iframe") or await page.query_selector(sel_variant)
-                            if fe:
-                                try:
-                                    await fe.scroll_into_view_if_needed()
-                                except Exception:
-                                    pass
-                                try:
-                                    await page.evaluate(
-                                        "(el) => { "
-                                        "  let p = el; "
-                                        "  while (p) { "
-                                        "    try { "
-                                        "      const s = p.style; "
-                                        "      s.overflow = 'visible'; "
-                                        "      s.clipPath = 'none'; "
-                                        "      s.webkitClipPath = 'none'; "
-                                        "      s.mask = 'none'; "
-                                        "      s.webkitMask = 'none'; "
-                                        "      s.maxHeight = 'none'; "
-                                        "      s.maxWidth = 'none'; "
-                                        "    } catch(_) {} "
-                                        "    p = p.parentElement; "
-                                        "  } "
-                                        "}",
-                                        fe,
-                                    )
-                                except Exception:
-                                    pass
-                                png = await stabilized_host_iframe_screenshot(fe)
-                            else:
-                                png = None
-                        except Exception:
-                            png = None
-
-                    if png:
-                        await _finalize_capture(
-                            con,
-                            storage_client,
-                            bucket_name,
-                            adv,
-                            ad_id,
-                            "sadbundle",
-                            png,
-                            dry_run,
-                            source_url=ad_url,
-                            variant_id=variant_id,
-                            click_url=None,
-                            capture_method=CAPTURE_METHOD_SCREENSHOT,
-                            capture_target="host_iframe",
-                        )
-                        captured_any = True
-                        if _stop_after_first(args):
-                            return "done"
-                        continue
+            if kind in ("sadbundle", "iframe") and src_abs:
+                capture = _capture_iframe_variant(
+                    context,
+                    con=con,
+                    storage_client=storage_client,
+                    bucket_name=bucket_name,
+                    http=http,
+                    args=args,
+                    t=t,
+                    ad_id=ad_id,
+                    ad_url=ad_url,
+                    adv=adv,
+                    variant_id=variant_id,
+                    src_abs=src_abs,
+                    dry_run=dry_run,
+                )
+                if not _stop_after_first(args):
+                    # Each variant renders on its own page, so let it load while the loop
+                    # activates the next tile on the host page; results are collected below.
+                    pending_iframes.append((asyncio.create_task(_bounded(capture)), dom_index, variant_id))
+                    continue
+                if await capture or await _capture_host_iframe_fallback(
+                    page,
+                    con=con,
+                    storage_client=storage_client,
+                    bucket_name=bucket_name,
+                    ad_id=ad_id,
+                    ad_url=ad_url,
+                    adv=adv,
+                    variant_id=variant_id,
+                    dom_index=dom_index,
+                    dry_run=dry_run,
+                ):
+                    return "done"
+
+        if pending_iframes:
+            results = await asyncio.gather(*(task for task, _, _ in pending_iframes), return_exceptions=True)
+            for (_, dom_index, variant_id), captured in zip(pending_iframes, results):
+                if isinstance(captured, BaseException):
+                    raise captured
+                if captured or await _capture_host_iframe_fallback(
+                    page,
+                    con=con,
+                    storage_client=storage_client,
+                    bucket_name=bucket_name,
+                    ad_id=ad_id,
+                    ad_url=ad_url,
+                    adv=adv,
+                    variant_id=variant_id,
+                    dom_index=dom_index,
+                    dry_run=dry_run,
+                ):
+                    captured_any = True
+        if finalizing and await _drain_finalizing():
+            captured_any = True
         if captured_any:
             return "done"
         # If we got here, no captures succeeded; fall back to policy/error checks
@@ -2338,7 +2766,18 @@ async def _process_with_browser(
     except PlaywrightError as exc:
         raise BrowserRestartRequired(str(exc)) from exc
     finally:
-        await cleanup_playwright(context, active_browser if owns_browser else None, trace, ad_id)
+        # Early exits (terminal status, errors) must not leave variant pages rendering.
+        for task, _, _ in pending_iframes:
+            task.cancel()
+        if pending_iframes:
+            await asyncio.gather(*(task for task, _, _ in pending_iframes), return_exceptions=True)
+        # Captures already taken are still stored (or their failure recorded) on early exits.
+        if finalizing:
+            await _drain_finalizing()
+        if warm_context is not None and context is not None:
+            await warm_context.release()
+        else:
+            await cleanup_playwright(context, active_browser if owns_browser else None, trace, ad_id)
 
 
 async def process_ad(
@@ -2354,6 +2793,7 @@ async def process_ad(
     args=None,
     *,
     browser=None,
+    warm_context: _WarmContext | None = None,
 ) -> str:
     """Process one ad end‑to‑end. Returns 'done' | 'terminal' | 'error'."""
 
@@ -2389,6 +2829,7 @@ async def process_ad(
             dry_run=dry_run,
             trace=trace,
             args=args,
+            warm_context=warm_context,
         )
     except BrowserRestartRequired as exc:
         if manage_browser:
@@ -2415,13 +2856,31 @@ async def _finalize_capture(
     source_url: str | None,
     variant_id: str,
     click_url: str | None = None,
-) -> None:
+) -> bool:
     """
     Canonicalize PNG, upload to GCS with ordered metadata, and mark DB success.
     Assumes caller has already upserted 'pending' for (ad_id, variant_id).
+    Returns False without storing anything when the capture is below GATC_MIN_ASSET_PX,
+    so callers can move on to their next capture strategy.
     """
+    if MIN_ASSET_DIM_PX:
+        dims = png_dimensions(png_bytes)
+        if dims and min(dims) < MIN_ASSET_DIM_PX:
+            jlog(
+                "info",
+                event="asset_too_small",
+                ad_id=ad_id,
+                advertiser_id=adv,
+                variant_id=variant_id,
+                capture_target=capture_target,
+                width=dims[0],
+                height=dims[1],
+                min_px=MIN_ASSET_DIM_PX,
+            )
+            return False
+
     # Normalize and hash
-    norm_png, sha256, phash, width, height = normalize_and_hash(png_bytes, trim=True)
+    norm_png, sha256, phash, width, height = await normalize_and_hash_async(png_bytes, trim=True)
 
     ocr_result: OCRResult | None = None
     if not dry_run:
@@ -2474,20 +2933,8 @@ async def _finalize_capture(
         dry_run=dry_run,
     )
 
-    # Ensure assets row exists
-    ensure_asset_row(
-        con,
-        asset_id=asset_id,
-        phash=phash,
-        w=width,
-        h=height,
-        fbytes=fbytes,
-        canonical_gcs=canonical_gcs,
-        dry_run=dry_run,
-    )
-
-    # Link success to ads row (variant-scoped)
-    link_asset_success(
+    # Ensure assets row exists and link success to ads row (variant-scoped)
+    finalize_ad(
         con,
         adv_id=adv,
         ad_id=ad_id,
@@ -2507,6 +2954,7 @@ async def _finalize_capture(
         ocr_language=ocr_language,
         ocr_confidence=ocr_confidence,
     )
+    return True
 
 
 # ============================
@@ -2518,6 +2966,8 @@ def iter_manifest_entries(path: str) -> Iterable[tuple[str, str, str]]:
     """
     Yield (ad_id, ad_url, advertiser_id) tuples from a manifest file.
 
+    Rows are read lazily, so memory use does not grow with the manifest size.
+
     Accepted formats:
     - CSV with headers (ad_id, ad_url, advertiser_id)
     - JSON Lines where each object provides the same keys (camelCase variants allowed)
@@ -2568,21 +3018,48 @@ def iter_manifest_entries(path: str) -> Iterable[tuple[str, str, str]]:
         raise FileNotFoundError(f"Manifest file not found: {resolved}") from exc
 
 
-def fetch_image_ads_stream(
-    client: bigquery.Client,
-    batch_size: int,
+def _bq_date_literal(value: str) -> str:
+    """Render an ISO date as a typed BigQuery ``DATE`` literal (validated, so safe to inline).
+
+    Comparing ``date_range_start`` against a typed literal keeps the predicate on the
+    raw column, with no implicit cast that could block pruning.
+    """
+    return f"DATE '{date.fromisoformat(value).isoformat()}'"
+
+
+@lru_cache(maxsize=None)
+def _shard_predicate(shard: int, shard_count: int) -> str:
+    """SQL filter keeping only this shard's Ad_IDs; empty when not sharding.
+
+    Computes :func:`stable_int_hash` in SQL (the first 4 bytes of SHA1, big-endian), so
+    streaming, manifest, direct-URL and advertiser modes all put an Ad_ID in the same shard.
+    """
+    if shard_count <= 1:
+        return ""
+    return f"MOD(CAST(CONCAT('0x', TO_HEX(SUBSTR(SHA1(Ad_ID), 1, 4))) AS INT64), {int(shard_count)}) = {int(shard)}"
+
+
+def build_image_ads_query(
     start_date: str | None,
     end_date: str | None,
     order_by: str,
     sql_limit: int | None,
-    bq_location: str | None,
-) -> Iterable[tuple[str, str, str]]:
-    """Yield (Ad_ID, Ad_URL, Advertiser_ID) respecting filters and order."""
+    *,
+    shard: int = 0,
+    shard_count: int = 1,
+) -> str:
+    """Return the streaming BigQuery SQL for IMAGE creatives.
+
+    Date bounds are plain range predicates on ``date_range_start`` (never
+    ``EXTRACT(YEAR ...)``), so year slices stay prunable.
+    """
     filters = ["Ad_Type='IMAGE'", r"REGEXP_CONTAINS(Regions, r'\bUS\b')"]
     if start_date:
-        filters.append(f"date_range_start >= '{start_date}'")
+        filters.append(f"date_range_start >= {_bq_date_literal(start_date)}")
     if end_date:
-        filters.append(f"date_range_start <= '{end_date}'")
+        filters.append(f"date_range_start <= {_bq_date_literal(end_date)}")
+    if shard_pred := _shard_predicate(shard, shard_count):
+        filters.append(shard_pred)
     where_clause = " AND ".join(filters)
 
     order_clause = ""
@@ -2593,13 +3070,29 @@ def fetch_image_ads_stream(
     elif order_by == "advertiser":
         order_clause = "ORDER BY Advertiser_ID ASC"
 
-    sql = f"""
+    return f"""
     SELECT Ad_ID, Ad_URL, Advertiser_ID
       FROM `bigquery-public-data.google_political_ads.creative_stats`
      WHERE {where_clause}
       {order_clause}
       {('LIMIT ' + str(sql_limit)) if sql_limit else ''}
     """.strip()
+
+
+def fetch_image_ads_stream(
+    client: bigquery.Client,
+    batch_size: int,
+    start_date: str | None,
+    end_date: str | None,
+    order_by: str,
+    sql_limit: int | None,
+    bq_location: str | None,
+    *,
+    shard: int = 0,
+    shard_count: int = 1,
+) -> Iterable[tuple[str, str, str]]:
+    """Yield (Ad_ID, Ad_URL, Advertiser_ID) respecting filters, order and sharding."""
+    sql = build_image_ads_query(start_date, end_date, order_by, sql_limit, shard=shard, shard_count=shard_count)
     jlog("info", event="bq_query", sql=sql)
 
     page_sz = batch_size
@@ -2696,6 +3189,8 @@ async def producer(queue: asyncio.Queue, con, bq_client: bigquery.Client, args:
          WHERE Ad_ID = @ad_id AND Ad_Type='IMAGE' AND REGEXP_CONTAINS(Regions, r'\\bUS\\b')
          LIMIT 1
         """.strip()
+        from google.cloud import bigquery
+
         qcfg = bigquery.QueryJobConfig(query_parameters=[bigquery.ScalarQueryParameter("ad_id", "STRING", args.ad_id)])
         job = bq_client.query(sql, job_config=qcfg, location=args.bq_location)
         rows = list(job.result())
@@ -2729,6 +3224,11 @@ async def producer(queue: asyncio.Queue, con, bq_client: bigquery.Client, args:
         shard=args.shard,
         shard_count=args.shard_count,
     )
+
+    def _remaining(count: int) -> int | None:
+        return args.max_ads - count if args.max_ads else None
+
+    batch: list[tuple[str, str, str]] = []
     for ad_id, ad_url, adv in fetch_image_ads_stream(
         bq_client,
         args.batch_size,
@@ -2737,40 +3237,75 @@ async def producer(queue: asyncio.Queue, con, bq_client: bigquery.Client, args:
         args.order_by,
         args.sql_limit,
         args.bq_location,
+        shard=args.shard,
+        shard_count=args.shard_count,
     ):
+        # Shard filtering happens in the query (see _shard_predicate).
         if adv in args.skip_advertisers:
             continue
-        if args.shard_count > 1 and (stable_int_hash(ad_id) % args.shard_count != args.shard):
-            continue
-        row: tuple[str] | None = None
+        batch.append((ad_id, ad_url, adv))
+        if len(batch) >= PENDING_CHECK_BATCH:
+            sent += await _enqueue_pending_batch(queue, con, batch, args, remaining=_remaining(sent))
+            batch.clear()
+            if args.max_ads and sent >= args.max_ads:
+                break
+    else:
+        if batch:
+            sent += await _enqueue_pending_batch(queue, con, batch, args, remaining=_remaining(sent))
+
+    for _ in range(args.concurrency):
+        await queue.put(None)
+
+
+async def _enqueue_pending_batch(
+    queue: asyncio.Queue,
+    con,
+    batch: list[tuple[str, str, str]],
+    args: CliArgs,
+    *,
+    remaining: int | None,
+) -> int:
+    """Skip already-finished ads with one status query and enqueue the rest.
+
+    Pending rows are written per ad by ``_process_with_browser``, as for every other input mode.
+
+    Returns the number of ads enqueued (at most ``remaining`` when set).
+    """
+    statuses: dict[str, str] = {}
+    if not args.rescrape_done:
         with con.cursor() as cur:
             cur.execute(
-                "SELECT status FROM ads WHERE ad_id=%s AND variant_id=%s",
-                (ad_id, IMAGE_VARIANT_ID),
+                "SELECT ad_id, status FROM ads WHERE ad_id = ANY(%s) AND variant_id=%s",
+                ([ad_id for ad_id, _, _ in batch], IMAGE_VARIANT_ID),
             )
-            row = cur.fetchone()
-        if not args.rescrape_done and row and row[0] not in ("pending", "error", "rate_limited_429"):
+            statuses = dict(cur.fetchall())
+    todo: list[tuple[str, str, str]] = []
+    for ad_id, ad_url, adv in batch:
+        status = statuses.get(ad_id)
+        if status and status not in ("pending", "error", "rate_limited_429"):
             jlog(
                 "info",
                 event="skip_existing_success",
                 ad_id=ad_id,
                 advertiser_id=adv,
-                status=row[0],
+                status=status,
             )
             continue
-        await queue.put((ad_id, ad_url, adv))
-        sent += 1
-        if args.max_ads and sent >= args.max_ads:
+        todo.append((ad_id, ad_url, adv))
+        if remaining is not None and len(todo) >= remaining:
             break
-
-    for _ in range(args.concurrency):
-        await queue.put(None)
+    for item in todo:
+        await queue.put(item)
+    return len(todo)
 
 
 async def consumer(queue: asyncio.Queue, con, storage_client: storage.Client, args: CliArgs, *, bucket_name: str) -> None:
     """Worker loop: process items with bounded retries and polite pacing."""
     async with async_playwright() as pw:
         browser = await pw.chromium.launch(headless=True, args=CHROMIUM_LAUNCH_ARGS)
+        # Tracing and the frame inventory hook are per-context, so debug runs keep one context per ad.
+        reuse = CONTEXT_REUSE_MAX_ADS > 0 and not (args.trace or args.debug_frames)
+        warm = _WarmContext() if reuse else None
         try:
             while True:
                 item = await queue.get()
@@ -2793,8 +3328,11 @@ async def consumer(queue: asyncio.Queue, con, storage_client: storage.Client, ar
                             args.trace,
                             args=args,
                             browser=browser,
+                            warm_context=warm,
                         )
                     except BrowserRestartRequired as exc:
+                        if warm is not None:
+                            await warm.discard()
                         try:
                             await browser.close()
                         except Exception:
@@ -2825,6 +3363,8 @@ async def consumer(queue: asyncio.Queue, con, storage_client: storage.Client, ar
                     attempt += 1
                 queue.task_done()
         finally:
+            if warm is not None:
+                await warm.discard()
             try:
                 await browser.close()
             except Exception:
@@ -2845,6 +3385,9 @@ async def run(
     """Execute the IMAGE pipeline for the supplied CLI arguments."""
 
     project_id = args.project_id or DEFAULT_PROJECT_ID
+    # Cloud clients are imported on first use so --help and argument errors stay fast.
+    from google.cloud import bigquery, storage  # type: ignore[attr-defined]
+
     bq_client = bq_client or bigquery.Client(project=project_id)
     storage_client = storage_client or storage.Client(project=project_id)
 
@@ -2858,20 +3401,38 @@ async def run(
         bq_location=args.bq_location,
     )
 
-    con = sql_connect(args.sql_conn, args.db_host, args.db_port)
-    con.autocommit = True
-
-    mon = asyncio.create_task(monitor_summary(con, interval=60))
-    queue: asyncio.Queue = asyncio.Queue()
-    prod = asyncio.create_task(producer(queue, con, bq_client, args))
-    workers = [asyncio.create_task(consumer(queue, con, storage_client, args, bucket_name=bucket_name)) for _ in range(args.concurrency)]
+    # Both connections come from the shared pool so retries and re-runs in the same
+    # process reuse already-authenticated sessions.
+    db = (args.sql_conn, args.db_host, args.db_port)
+    with checkout(*db, maxconn=args.concurrency + 2) as con, checkout(*db, maxconn=args.concurrency + 2) as writer_con:
+        con.autocommit = True
+        # Per-ad writes are queued and committed in batches on their own connection,
+        # flushed off the event loop; reads stay on ``con``. A dropped writer
+        # connection is replaced with a fresh one rather than losing statuses.
+        writer = DbWriter(writer_con, connect=lambda: sql_connect(*db))
+
+        mon = asyncio.create_task(monitor_summary(con, interval=60))
+        flusher = asyncio.create_task(writer.run())
+        # Bounded so the producer pauses while workers catch up: manifest and BigQuery
+        # rows are pulled lazily and at most --batch-size jobs are held in memory.
+        queue: asyncio.Queue = asyncio.Queue(maxsize=args.batch_size)
+        prod = asyncio.create_task(producer(queue, con, bq_client, args))
+        workers = [
+            asyncio.create_task(consumer(queue, writer, storage_client, args, bucket_name=bucket_name)) for _ in range(args.concurrency)
+        ]
 
-    await prod
-    await queue.join()
-    for w in workers:
-        w.cancel()
-    mon.cancel()
-    con.close()
+        try:
+            # If the writer cannot reconnect, stop here instead of scraping ads whose statuses cannot be saved.
+            await writer.watch(prod)
+            await writer.watch(queue.join())
+        finally:
+            # Producer errors and cancellation land here too: stop everything still using the
+            # connections, then commit what the writer holds before checkout returns them.
+            tasks = [prod, mon, *workers]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await writer.finish(flusher)
 
 
 class BrowserRestartRequired(RuntimeError):
@@ -2,14 +2,26 @@
 
 from __future__ import annotations
 
+import atexit
 import json
 import logging
+import os
+import queue
 from contextlib import contextmanager
 from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any, Iterator
 
+try:  # optional fast path; same keys and values as the json fallback, compact separators
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+    orjson = None  # type: ignore[assignment]
+
 UTC = getattr(datetime, "UTC", timezone.utc)
 _LOGGER_NAME = "scraper"
+# Hand records to a listener thread so callers only enqueue; stream writes happen off the
+# event loop. Set GATC_LOG_QUEUE=0 to write synchronously from the calling thread.
+LOG_QUEUE = os.getenv("GATC_LOG_QUEUE", "1").lower() in {"1", "true", "yes", "on"}
 _configured = False
 _base_context: dict[str, Any] = {}
 _context_stack: list[dict[str, Any]] = []
@@ -22,6 +34,13 @@ def configure_logging(level: int = logging.INFO) -> None:
     if _configured:
         return
     logging.basicConfig(level=level, format="%(asctime)s %(levelname)s %(message)s")
+    if LOG_QUEUE:
+        root = logging.getLogger()
+        records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        listener = QueueListener(records, *root.handlers, respect_handler_level=True)
+        root.handlers = [QueueHandler(records)]
+        listener.start()
+        atexit.register(listener.stop)  # drains queued records before exit
     _configured = True
 
 
@@ -55,12 +74,21 @@ def _utcnow_iso() -> str:
     return datetime.now(UTC).isoformat()
 
 
+def _dumps(record: dict[str, Any]) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(record, option=orjson.OPT_SORT_KEYS).decode("utf-8")
+        except TypeError:
+            pass  # e.g. >64-bit ints or non-str keys; let json handle or raise as before
+    return json.dumps(record, ensure_ascii=False, sort_keys=True)
+
+
 def jlog(level: str, /, **fields: Any) -> None:
     """Emit a structured JSON log payload under the ``scraper`` logger."""
 
     log = logging.getLogger(_LOGGER_NAME)
     record = {"ts": _utcnow_iso(), **_merged_context(), **fields}
-    getattr(log, level.lower())(json.dumps(record, ensure_ascii=False, sort_keys=True))
+    getattr(log, level.lower())(_dumps(record))
 
 
 def adlog(event: str, *, ad_id: str, advertiser_id: str, url: str, **kw: Any) -> None:
@@ -5,13 +5,13 @@ from __future__ import annotations
 import os
 from dataclasses import dataclass
 from functools import lru_cache
-from typing import Optional
-
-from google.auth.exceptions import DefaultCredentialsError
-from google.cloud import vision
+from typing import TYPE_CHECKING, Optional
 
 from .logging import jlog
 
+if TYPE_CHECKING:  # pragma: no cover - typing helper
+    from google.cloud import vision
+
 MAX_OCR_TEXT_CHARS = 20000
 
 
@@ -31,6 +31,9 @@ _credentials_failed = False
 def _vision_client() -> vision.ImageAnnotatorClient:
     """Return a memoized Vision API client."""
 
+    # Imported here: OCR is off by default and the Vision client is slow to import.
+    from google.cloud import vision
+
     return vision.ImageAnnotatorClient()
 
 
@@ -55,6 +58,9 @@ def extract_text_from_image(image_bytes: bytes) -> OCRResult:
     if not image_bytes:
         return OCRResult(text=None, language=None, confidence=None)
 
+    from google.auth.exceptions import DefaultCredentialsError
+    from google.cloud import vision
+
     client = _vision_client()
     image = vision.Image(content=image_bytes)
     try:
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
-from google.cloud import storage  # type: ignore[attr-defined]
+from typing import TYPE_CHECKING
 
 from .logging import jlog
 
+if TYPE_CHECKING:  # pragma: no cover - typing helper; the client is built by callers
+    from google.cloud import storage  # type: ignore[attr-defined]
+
 
 def canonical_asset_path_image(bucket: str, sha256_hex: str) -> str:
     return f"gs://{bucket}/assets/image/{sha256_hex[:2]}/{sha256_hex}.png"
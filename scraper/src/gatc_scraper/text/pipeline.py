@@ -56,9 +56,13 @@ import argparse
 import asyncio
 import logging
 import random
-from collections.abc import Iterable
-from dataclasses import dataclass
-from datetime import date, datetime, timezone
+import re
+import sys
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, fields
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
 from gatc_scraper import (
     CHROMIUM_LAUNCH_ARGS,
@@ -67,8 +71,9 @@ from gatc_scraper import (
     cleanup_playwright,
     dump_frame_inventory,
     ensure_debug_html,
+    install_frame_inventory,
     jlog,
-    normalize_and_hash,
+    normalize_and_hash_async,
     parse_ids_from_url,
     stable_int_hash,
     wait_policy_or_errors,
@@ -83,10 +88,12 @@ from gatc_scraper import (
     upload_png_text as upload_png,
 )
 from gatc_scraper.db import (
-    ensure_asset_row as db_ensure_asset_row,
+    DbWriter,
+    checkout,
+    sql_connect,
 )
 from gatc_scraper.db import (
-    link_asset_success as db_link_asset_success,
+    finalize_ad as db_finalize_ad,
 )
 from gatc_scraper.db import (
     record_error as db_record_error,
@@ -94,16 +101,15 @@ from gatc_scraper.db import (
 from gatc_scraper.db import (
     record_status as db_record_status,
 )
-from gatc_scraper.db import (
-    sql_connect,
-)
 from gatc_scraper.db import (
     upsert_pending as db_upsert_pending,
 )
 from gatc_scraper.ocr import OCRResult, extract_text_from_image, sanitize_ocr_text
-from google.cloud import bigquery, storage  # type: ignore[attr-defined]
 from playwright.async_api import Page, TimeoutError, async_playwright
 
+if TYPE_CHECKING:
+    from google.cloud import bigquery, storage  # type: ignore[attr-defined]
+
 # Back-compat for Python < 3.11 (no datetime.UTC)
 UTC = timezone.utc
 
@@ -119,6 +125,7 @@ DEFAULT_DEVICE_SCALE_FACTOR = 3
 DEFAULT_PAGE_TIMEOUT_MS = 30_000
 DEFAULT_IFRAME_TIMEOUT_MS = 15_000
 DEFAULT_SQL_CONN = "your-project:your-region:your-instance"
+ORDER_BY_CHOICES = ("none", "date_asc", "date_desc", "advertiser")
 TEXT_VARIANT_ID = "v1"  # Primary variant identifier for TEXT creatives
 
 # Log format: human‑readable time + JSON payload per line
@@ -139,7 +146,11 @@ def get_scraper_version() -> str:
 # ============================
 
 
-@dataclass(frozen=True)
+# Advertiser IDs to skip; checked once per streamed row, so keep membership O(1).
+SkipSet = frozenset[str]
+
+
+@dataclass(frozen=True, slots=True)
 class CliArgs:
     project_id: str
     gcs_bucket: str
@@ -154,7 +165,7 @@ class CliArgs:
     start_date: str | None
     end_date: str | None
     order_by: str
-    skip_advertisers: list[str]
+    skip_advertisers: SkipSet
     ad_id: str | None
     ad_url: str | None
     advertiser_id: str | None
@@ -177,16 +188,50 @@ class CliArgs:
 
 
 def _coerce_dates(args: argparse.Namespace) -> None:
-    if getattr(args, "since_days", None):
-        today = datetime.now(UTC).date()
-        args.start_date = date.fromordinal(today.toordinal() - args.since_days).isoformat()
-    if getattr(args, "limit", None) and not args.sql_limit:
+    # A bare year selects that calendar year: --start-date=2024 becomes 2024-01-01, and
+    # end_date defaults to 2024-12-31 (inclusive, like --end-date) unless given.
+    if args.start_date and len(args.start_date) == 4 and args.start_date.isdigit():
+        year = int(args.start_date)
+        args.start_date = f"{year:04d}-01-01"
+        args.end_date = args.end_date or f"{year:04d}-12-31"
+    if args.end_date and len(args.end_date) == 4 and args.end_date.isdigit():
+        args.end_date = f"{int(args.end_date):04d}-12-31"
+    if args.since_days:
+        args.start_date = (datetime.now(UTC).date() - timedelta(days=args.since_days)).isoformat()
+    if args.limit and not args.sql_limit:
         args.sql_limit = args.limit
 
 
+_WARNED_SCANS: set[tuple[object, ...]] = set()
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def _is_iso_date(value: str) -> bool:
+    # fromisoformat alone is too lenient on 3.11+ (accepts 20240101, 2024-W01-1).
+    if not _ISO_DATE_RE.fullmatch(value):
+        return False
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
 def validate_args(args: argparse.Namespace) -> None:
     """Emit warnings/errors for likely mistakes or expensive runs."""
-    # Start/end consistency
+    # Fail fast on malformed input, before any browser or cloud client starts.
+    for name in ("start_date", "end_date"):
+        value = getattr(args, name)
+        if value and not _is_iso_date(value):
+            raise ValueError(f"{name} must be YYYY-MM-DD, got {value!r}")
+    if args.since_days is not None and args.since_days < 0:
+        raise ValueError(f"since_days must be >= 0, got {args.since_days}")
+    if args.shard_count < 1 or not 0 <= args.shard < args.shard_count:
+        raise ValueError(f"shard must satisfy 0 <= shard < shard_count, got shard={args.shard} shard_count={args.shard_count}")
+    if args.concurrency < 1 or args.batch_size < 1:
+        raise ValueError(f"concurrency and batch_size must be >= 1, got {args.concurrency} and {args.batch_size}")
+
+    # Start/end consistency (both ISO dates at this point, so string order is date order)
     if args.start_date and args.end_date and args.start_date > args.end_date:
         raise ValueError(f"start_date ({args.start_date}) is after end_date ({args.end_date})")
 
@@ -194,6 +239,13 @@ def validate_args(args: argparse.Namespace) -> None:
     if args.ad_url or args.ad_id:
         return
 
+    # Scan warnings depend only on these inputs; emit them once per process per combination
+    # so repeated parse_args calls (tests, re-entrant CLIs) do not flood the logs.
+    key = (args.start_date, args.end_date, args.since_days, args.sql_limit, args.max_ads, args.shard, args.shard_count)
+    if key in _WARNED_SCANS:
+        return
+    _WARNED_SCANS.add(key)
+
     # Potential full‑table scans
     no_dates = not args.start_date and not args.since_days and not args.end_date
     no_limit = not args.sql_limit and not args.max_ads
@@ -211,7 +263,7 @@ def validate_args(args: argparse.Namespace) -> None:
             "warning",
             event="sharded_full_scan",
             message=(
-                "Sharding is enabled but no date/limit provided; each shard will read pages of the full dataset. "
+                "Sharding is enabled but no date/limit provided; each shard's query will scan the full table. "
                 "Add --since-days or --sql-limit unless you truly want a whole-table pass."
             ),
             shard=args.shard,
@@ -219,7 +271,8 @@ def validate_args(args: argparse.Namespace) -> None:
         )
 
 
-def parse_args() -> CliArgs:
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(description="Download TEXT ads (US only)")
     p.add_argument("--project-id", default=DEFAULT_PROJECT_ID)
     p.add_argument("--gcs-bucket", default=DEFAULT_GCS_BUCKET)
@@ -231,11 +284,12 @@ def parse_args() -> CliArgs:
     p.add_argument("--user-agent", default=DEFAULT_USER_AGENT)
     p.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
     p.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
-    p.add_argument("--start-date")
-    p.add_argument("--end-date")
+    p.add_argument("--start-date", help="YYYY-MM-DD, or YYYY for that whole calendar year")
+    p.add_argument("--end-date", help="YYYY-MM-DD (inclusive), or YYYY for its last day")
     p.add_argument(
         "--order-by",
-        choices=["none", "date_asc", "date_desc", "advertiser"],
+        type=sys.intern,  # parsed value shares identity with the literals compared against downstream
+        choices=ORDER_BY_CHOICES,
         default="none",
     )
     p.add_argument("--skip-advertisers", nargs="*", default=[])
@@ -253,9 +307,9 @@ def parse_args() -> CliArgs:
     )
     p.add_argument(
         "--all-variants",
-        action="store_true",
-        default=True,  # <— default to saving all variants
-        help=("Capture and persist every detected variant (v1, v2, ...) instead of stopping after the first success."),
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Capture and persist every detected variant (v1, v2, ...); --no-all-variants stops after the first success.",
     )
     p.add_argument(
         "--trace",
@@ -309,46 +363,19 @@ def parse_args() -> CliArgs:
         "--bq-location",
         help="BigQuery location/region for query jobs (e.g., US, EU)",
     )
+    return p
+
 
-    ns = p.parse_args()
+def parse_args(argv: Sequence[str] | None = None) -> CliArgs:
+    """Parse ``argv`` (default: ``sys.argv[1:]``) into validated ``CliArgs``."""
+    # The parser only depends on import-time defaults, so it is built once per process.
+    ns = _build_parser().parse_args(argv)
     _coerce_dates(ns)
     validate_args(ns)
 
-    return CliArgs(
-        project_id=ns.project_id,
-        gcs_bucket=ns.gcs_bucket,
-        sql_conn=ns.sql_conn,
-        db_host=ns.db_host,
-        db_port=ns.db_port,
-        max_ads=ns.max_ads,
-        sql_limit=ns.sql_limit,
-        user_agent=ns.user_agent,
-        concurrency=ns.concurrency,
-        batch_size=ns.batch_size,
-        start_date=ns.start_date,
-        end_date=ns.end_date,
-        order_by=ns.order_by,
-        skip_advertisers=list(ns.skip_advertisers or []),
-        ad_id=ns.ad_id,
-        ad_url=ns.ad_url,
-        advertiser_id=ns.advertiser_id,
-        all_variants=ns.all_variants,
-        trace=ns.trace,
-        since_days=ns.since_days,
-        limit=ns.limit,
-        max_retries=ns.max_retries,
-        retry_base_ms=ns.retry_base_ms,
-        dry_run=ns.dry_run,
-        shard=ns.shard,
-        shard_count=ns.shard_count,
-        debug_frames=ns.debug_frames,
-        debug_html=ns.debug_html,
-        device_scale_factor=ns.device_scale_factor,
-        page_timeout_ms=ns.page_timeout_ms,
-        iframe_timeout_ms=ns.iframe_timeout_ms,
-        bq_location=ns.bq_location,
-        rescrape_done=ns.rescrape_done,
-    )
+    values = {f.name: getattr(ns, f.name) for f in fields(CliArgs)}
+    values["skip_advertisers"] = frozenset(map(sys.intern, ns.skip_advertisers or ()))
+    return CliArgs(**values)
 
 
 # ============================
@@ -372,51 +399,6 @@ def upsert_pending(con, ad_id: str, variant_id: str, source_url: str, advertiser
     )
 
 
-def link_asset_success(
-    con,
-    adv_id: str,
-    ad_id: str,
-    variant_id: str,
-    asset_id: str,
-    rmethod: str,
-    w: int,
-    h: int,
-    fbytes: int,
-    phash: str,
-    canonical_gcs: str,
-    *,
-    capture_method: str,
-    capture_target: str,
-    click_url: str | None = None,
-    ocr_text: str | None = None,
-    ocr_language: str | None = None,
-    ocr_confidence: float | None = None,
-    dry_run: bool = False,
-) -> None:
-    return db_link_asset_success(
-        con,
-        ad_type="TEXT",
-        advertiser_id=adv_id,
-        ad_id=ad_id,
-        variant_id=variant_id,
-        asset_id=asset_id,
-        render_method=rmethod,
-        width_px=w,
-        height_px=h,
-        file_bytes=fbytes,
-        phash=phash,
-        gcs_path=canonical_gcs,
-        capture_method=capture_method,
-        capture_target=capture_target,
-        click_url=click_url,
-        scraper_version=get_scraper_version(),
-        ocr_text=ocr_text,
-        ocr_language=ocr_language,
-        ocr_confidence=ocr_confidence,
-        dry_run=dry_run,
-    )
-
-
 def record_status(
     con, adv_id: str, ad_id: str, variant_id: str, status: str, last_error: str | None = None, *, dry_run: bool = False
 ) -> None:
@@ -442,25 +424,48 @@ def record_error(con, adv_id: str, ad_id: str, variant_id: str, msg: str, *, dry
     )
 
 
-def ensure_asset_row(
+def finalize_ad(
     con,
+    adv_id: str,
+    ad_id: str,
+    variant_id: str,
     asset_id: str,
-    phash: str,
+    rmethod: str,
     w: int,
     h: int,
     fbytes: int,
+    phash: str,
     canonical_gcs: str,
     *,
+    capture_method: str,
+    capture_target: str,
+    click_url: str | None = None,
+    ocr_text: str | None = None,
+    ocr_language: str | None = None,
+    ocr_confidence: float | None = None,
     dry_run: bool = False,
 ) -> None:
-    return db_ensure_asset_row(
+    """Ensure the asset row and link it to the variant in one DB round-trip."""
+    return db_finalize_ad(
         con,
+        ad_type="TEXT",
+        advertiser_id=adv_id,
+        ad_id=ad_id,
+        variant_id=variant_id,
         asset_id=asset_id,
-        phash=phash,
+        render_method=rmethod,
         width_px=w,
         height_px=h,
         file_bytes=fbytes,
+        phash=phash,
         gcs_path=canonical_gcs,
+        capture_method=capture_method,
+        capture_target=capture_target,
+        click_url=click_url,
+        scraper_version=get_scraper_version(),
+        ocr_text=ocr_text,
+        ocr_language=ocr_language,
+        ocr_confidence=ocr_confidence,
         dry_run=dry_run,
     )
 
@@ -521,6 +526,8 @@ async def process_ad(
                 browser = await pw.chromium.launch(args=CHROMIUM_LAUNCH_ARGS)
                 context = await browser.new_context(user_agent=user_agent, device_scale_factor=device_scale_factor)
                 context.set_default_timeout(page_timeout_ms)
+                if debug_frames:
+                    await install_frame_inventory(context)
 
                 # Optional tracing
                 if trace:
@@ -839,7 +846,7 @@ async def _finalize_capture(
     Assumes caller has already upserted 'pending' for (ad_id, variant_id).
     """
     # Normalize and hash
-    norm_png, sha256, phash, width, height = normalize_and_hash(png_bytes, trim=True)
+    norm_png, sha256, phash, width, height = await normalize_and_hash_async(png_bytes, trim=True)
 
     ocr_result: OCRResult | None = None
     if not dry_run:
@@ -891,20 +898,8 @@ async def _finalize_capture(
         dry_run=dry_run,
     )
 
-    # Ensure assets row exists
-    ensure_asset_row(
-        con,
-        asset_id=asset_id,
-        phash=phash,
-        w=width,
-        h=height,
-        fbytes=fbytes,
-        canonical_gcs=canonical_gcs,
-        dry_run=dry_run,
-    )
-
-    # Link success to ads row (variant-scoped)
-    link_asset_success(
+    # Ensure assets row exists and link success to ads row (variant-scoped)
+    finalize_ad(
         con,
         adv_id=adv,
         ad_id=ad_id,
@@ -930,6 +925,27 @@ async def _finalize_capture(
 # ============================
 
 
+def _bq_date_literal(value: str) -> str:
+    """Render an ISO date as a typed BigQuery ``DATE`` literal (validated, so safe to inline).
+
+    Comparing ``date_range_start`` against a typed literal keeps the predicate on the
+    raw column, with no implicit cast that could block pruning.
+    """
+    return f"DATE '{date.fromisoformat(value).isoformat()}'"
+
+
+@lru_cache(maxsize=None)
+def _shard_predicate(shard: int, shard_count: int) -> str:
+    """SQL filter keeping only this shard's Ad_IDs; empty when not sharding.
+
+    Computes :func:`stable_int_hash` in SQL (the first 4 bytes of SHA1, big-endian), so
+    streaming, manifest, direct-URL and advertiser modes all put an Ad_ID in the same shard.
+    """
+    if shard_count <= 1:
+        return ""
+    return f"MOD(CAST(CONCAT('0x', TO_HEX(SUBSTR(SHA1(Ad_ID), 1, 4))) AS INT64), {int(shard_count)}) = {int(shard)}"
+
+
 def fetch_text_ads_stream(
     client: bigquery.Client,
     batch_size: int,
@@ -937,13 +953,18 @@ def fetch_text_ads_stream(
     end_date: str | None,
     order_by: str,
     sql_limit: int | None,
+    *,
+    shard: int = 0,
+    shard_count: int = 1,
 ) -> Iterable[tuple[str, str, str]]:
-    """Yield (Ad_ID, Ad_URL, Advertiser_ID) respecting filters and order."""
+    """Yield (Ad_ID, Ad_URL, Advertiser_ID) respecting filters, order and sharding."""
     filters = ["Ad_Type='TEXT'", r"REGEXP_CONTAINS(Regions, r'\bUS\b')"]
     if start_date:
-        filters.append(f"date_range_start >= '{start_date}'")
+        filters.append(f"date_range_start >= {_bq_date_literal(start_date)}")
     if end_date:
-        filters.append(f"date_range_start <= '{end_date}'")
+        filters.append(f"date_range_start <= {_bq_date_literal(end_date)}")
+    if shard_pred := _shard_predicate(shard, shard_count):
+        filters.append(shard_pred)
     where_clause = " AND ".join(filters)
 
     order_clause = ""
@@ -1015,6 +1036,8 @@ async def producer(queue: asyncio.Queue, con, bq_client: bigquery.Client, args:
 
     # One‑ad by BigQuery lookup
     if args.ad_id:
+        from google.cloud import bigquery
+
         sql = """
         SELECT Ad_ID, Ad_URL, Advertiser_ID
           FROM `bigquery-public-data.google_political_ads.creative_stats`
@@ -1043,11 +1066,12 @@ async def producer(queue: asyncio.Queue, con, bq_client: bigquery.Client, args:
         args.end_date,
         args.order_by,
         args.sql_limit,
+        shard=args.shard,
+        shard_count=args.shard_count,
     ):
+        # Shard filtering happens in the query (see _shard_predicate).
         if adv in args.skip_advertisers:
             continue
-        if args.shard_count > 1 and (stable_int_hash(ad_id) % args.shard_count != args.shard):
-            continue
         row: tuple[str] | None = None
         with con.cursor() as cur:
             cur.execute(
@@ -1129,19 +1153,36 @@ async def run(
 ) -> None:
     """Execute the TEXT pipeline for the supplied CLI arguments."""
 
+    # Cloud clients are imported on first use so --help and argument errors stay fast.
+    from google.cloud import bigquery, storage  # type: ignore[attr-defined]
+
     bq_client = bq_client or bigquery.Client(project=args.project_id)
     storage_client = storage_client or storage.Client(project=args.project_id)
-    con = sql_connect(args.sql_conn, args.db_host, args.db_port)
-    con.autocommit = True
-
-    mon = asyncio.create_task(monitor_summary(con, interval=60))
-    queue: asyncio.Queue = asyncio.Queue()
-    prod = asyncio.create_task(producer(queue, con, bq_client, args))
-    workers = [asyncio.create_task(consumer(queue, con, storage_client, args)) for _ in range(args.concurrency)]
-
-    await prod
-    await queue.join()
-    for w in workers:
-        w.cancel()
-    mon.cancel()
-    con.close()
+    # Both connections come from the shared pool so retries and re-runs in the same
+    # process reuse already-authenticated sessions.
+    db = (args.sql_conn, args.db_host, args.db_port)
+    with checkout(*db, maxconn=args.concurrency + 2) as con, checkout(*db, maxconn=args.concurrency + 2) as writer_con:
+        con.autocommit = True
+        # Per-ad writes are queued and committed in batches on their own connection,
+        # flushed off the event loop; reads stay on ``con``. A dropped writer
+        # connection is replaced with a fresh one rather than losing statuses.
+        writer = DbWriter(writer_con, connect=lambda: sql_connect(*db))
+
+        mon = asyncio.create_task(monitor_summary(con, interval=60))
+        flusher = asyncio.create_task(writer.run())
+        queue: asyncio.Queue = asyncio.Queue()
+        prod = asyncio.create_task(producer(queue, con, bq_client, args))
+        workers = [asyncio.create_task(consumer(queue, writer, storage_client, args)) for _ in range(args.concurrency)]
+
+        try:
+            # If the writer cannot reconnect, stop here instead of scraping ads whose statuses cannot be saved.
+            await writer.watch(prod)
+            await writer.watch(queue.join())
+        finally:
+            # Producer errors and cancellation land here too: stop everything still using the
+            # connections, then commit what the writer holds before checkout returns them.
+            tasks = [prod, mon, *workers]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await writer.finish(flusher)
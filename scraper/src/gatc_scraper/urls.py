@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import re
 import urllib.parse
+from functools import lru_cache
 
 GATC_URL_RE = re.compile(r"/advertiser/(AR[0-9]+)/creative/(CR[0-9]+)")
 
@@ -18,9 +19,14 @@ def select_primary_click_url(urls: list[str] | None) -> str | None:
 
 
 def normalize_click_url(url: str) -> str | None:
+    if not url or not isinstance(url, str):
+        return None
+    return _normalize_click_url(url)
+
+
+@lru_cache(maxsize=4096)  # pure; the same redirector/anchor URLs recur across frames and ads
+def _normalize_click_url(url: str) -> str | None:
     try:
-        if not url:
-            return None
         parsed = urllib.parse.urlparse(url)
         if parsed.scheme not in ("http", "https", ""):
             return None
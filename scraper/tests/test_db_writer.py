@@ -0,0 +1,275 @@
+import asyncio
+import importlib
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import psycopg2
+import pytest
+from gatc_scraper.db import postgres
+from gatc_scraper.db.postgres import DbWriter, DbWriterFailed
+
+
+class _FakeCursor:
+    def __init__(self, con: "_FakeConnection") -> None:
+        self.con = con
+
+    def __enter__(self) -> "_FakeCursor":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+    def execute(self, sql: str, params: tuple) -> None:
+        self.con.run(sql, [params])
+
+
+class _FakeConnection:
+    """Record committed statements; ``fail_on`` params raise, ``drop_on`` params close the connection."""
+
+    def __init__(self, *, fail_on=(), drop_on=()) -> None:
+        self.fail_on = set(fail_on)
+        self.drop_on = set(drop_on)
+        self.closed = 0
+        self.calls: list[tuple[str, list[tuple]]] = []
+        self.committed: list[tuple[str, tuple]] = []
+        self._txn: list[tuple[str, tuple]] = []
+
+    def __enter__(self) -> "_FakeConnection":
+        if self.closed:
+            raise psycopg2.InterfaceError("connection already closed")
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if exc_type is None:
+            self.committed.extend(self._txn)
+        self._txn = []
+
+    def cursor(self) -> _FakeCursor:
+        return _FakeCursor(self)
+
+    def close(self) -> None:
+        self.closed = 1
+
+    def run(self, sql: str, rows: list[tuple]) -> None:
+        self.calls.append((sql, rows))
+        for params in rows:
+            if params in self.drop_on:
+                self.closed = 2
+                raise psycopg2.OperationalError("server closed the connection unexpectedly")
+            if params in self.fail_on:
+                raise psycopg2.DataError("bad row")
+            self._txn.append((sql, params))
+
+
+@pytest.fixture(autouse=True)
+def _fake_execute_batch(monkeypatch):
+    monkeypatch.setattr(postgres, "execute_batch", lambda cur, sql, rows, page_size: cur.con.run(sql, rows))
+    monkeypatch.setattr(postgres.time, "sleep", lambda s: None)
+
+
+def test_flush_groups_consecutive_templates_and_keeps_fifo_order():
+    con = _FakeConnection()
+    writer = DbWriter(con, batch_size=10)
+    for sql, n in (("A", 1), ("A", 2), ("B", 3), ("A", 4)):
+        writer.submit(sql, (n,))
+
+    assert writer.flush() == 4
+    assert con.calls == [("A", [(1,), (2,)]), ("B", [(3,)]), ("A", [(4,)])]
+    assert con.committed == [("A", (1,)), ("A", (2,)), ("B", (3,)), ("A", (4,))]
+    assert len(writer) == 0
+
+
+def test_flush_takes_at_most_batch_size_statements():
+    con = _FakeConnection()
+    writer = DbWriter(con, batch_size=2)
+    writer.submit_many([("A", (n,), None) for n in range(5)])
+
+    writer.drain()
+
+    assert [rows for _, rows in con.calls] == [[(0,), (1,)], [(2,), (3,)], [(4,)]]
+
+
+def test_failed_batch_is_replayed_row_by_row():
+    con = _FakeConnection(fail_on={(2,)})
+    writer = DbWriter(con, batch_size=10)
+    committed: list[int] = []
+    for n in (1, 2, 3):
+        writer.submit("A", (n,), on_commit=lambda n=n: committed.append(n))
+
+    writer.flush()
+
+    assert con.committed == [("A", (1,)), ("A", (3,))]
+    assert committed == [1, 3]
+
+
+def test_dropped_connection_requeues_batch_and_reconnects():
+    dead = _FakeConnection(drop_on={(2,)})
+    fresh = _FakeConnection()
+    writer = DbWriter(dead, connect=lambda: fresh, batch_size=10)
+    writer.submit_many([("A", (n,), None) for n in (1, 2, 3)])
+    writer.submit("B", (4,))
+
+    writer.drain()
+
+    assert dead.committed == []
+    assert writer.con is fresh
+    assert fresh.committed == [("A", (1,)), ("A", (2,)), ("A", (3,)), ("B", (4,))]
+
+
+def test_dropped_connection_during_replay_requeues_the_rest():
+    con = _FakeConnection(fail_on={(1,)})
+    fresh = _FakeConnection()
+    writer = DbWriter(con, connect=lambda: fresh, batch_size=10)
+    writer.submit_many([("A", (n,), None) for n in (1, 2, 3)])
+    con.drop_on = {(3,)}
+
+    writer.drain()
+
+    assert con.committed == [("A", (2,))]
+    assert fresh.committed == [("A", (3,))]
+
+
+def test_dropped_connection_without_reconnect_raises_and_keeps_statements():
+    con = _FakeConnection(drop_on={(1,)})
+    writer = DbWriter(con, batch_size=10)
+    writer.submit("A", (1,))
+
+    with pytest.raises(psycopg2.OperationalError):
+        writer.flush()
+    assert len(writer) == 1
+
+
+def test_reconnect_gives_up_after_configured_attempts(monkeypatch):
+    monkeypatch.setattr(postgres, "DB_RECONNECT_ATTEMPTS", 2)
+    attempts: list[int] = []
+
+    def connect():
+        attempts.append(1)
+        raise psycopg2.OperationalError("could not connect")
+
+    writer = DbWriter(_FakeConnection(drop_on={(1,)}), connect=connect, batch_size=10)
+    writer.submit("A", (1,))
+
+    with pytest.raises(psycopg2.OperationalError, match="could not connect"):
+        writer.flush()
+    assert len(attempts) == 2
+    assert len(writer) == 1
+
+
+def test_raising_on_commit_callback_does_not_stop_later_callbacks():
+    con = _FakeConnection()
+    writer = DbWriter(con, batch_size=10)
+    seen: list[int] = []
+
+    def boom() -> None:
+        raise ValueError("log sink gone")
+
+    writer.submit("A", (1,), on_commit=boom)
+    writer.submit("A", (2,), on_commit=lambda: seen.append(2))
+
+    assert writer.flush() == 2
+    assert seen == [2]
+
+
+def test_watch_raises_when_writer_fails():
+    async def scenario() -> None:
+        writer = DbWriter(_FakeConnection(drop_on={(1,)}), flush_interval_s=0.01)
+        writer.submit("A", (1,))
+        flusher = asyncio.create_task(writer.run())
+        with pytest.raises(DbWriterFailed):
+            await writer.watch(asyncio.sleep(10))
+        with pytest.raises(psycopg2.OperationalError):
+            await flusher
+
+    asyncio.run(scenario())
+
+
+def test_watch_returns_result_while_writer_is_healthy():
+    async def scenario() -> None:
+        writer = DbWriter(_FakeConnection(), flush_interval_s=0.01)
+        flusher = asyncio.create_task(writer.run())
+
+        async def work() -> int:
+            return 7
+
+        assert await writer.watch(work()) == 7
+        writer.stop()
+        await flusher
+
+    asyncio.run(scenario())
+
+
+def test_finish_drains_what_a_dead_flusher_left(monkeypatch):
+    monkeypatch.setattr(postgres, "DB_RECONNECT_ATTEMPTS", 1)
+    fresh = _FakeConnection()
+    replies = iter([psycopg2.OperationalError("could not connect"), fresh])
+
+    def connect():
+        reply = next(replies)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    async def scenario() -> None:
+        writer = DbWriter(_FakeConnection(drop_on={(1,)}), connect=connect, flush_interval_s=0.01)
+        writer.submit("A", (1,))
+        flusher = asyncio.create_task(writer.run())
+        with pytest.raises(DbWriterFailed):
+            await writer.watch(asyncio.sleep(10))
+        await writer.finish(flusher)
+        assert len(writer) == 0
+
+    asyncio.run(scenario())
+    assert fresh.committed == [("A", (1,))]
+    assert fresh.closed
+
+
+@pytest.mark.parametrize("module", ["image", "text"])
+def test_run_flushes_queued_statements_when_the_producer_fails(monkeypatch, module):
+    pipeline = importlib.import_module(f"gatc_scraper.{module}.pipeline")
+    reader, writer_con = _FakeConnection(), _FakeConnection()
+    checkouts = iter([reader, writer_con])
+    submitted = asyncio.Event()
+    cancelled: list[str] = []
+
+    @contextmanager
+    def fake_checkout(*args, **kwargs):
+        yield next(checkouts)
+
+    async def fake_consumer(queue, writer, *args, **kwargs):
+        writer.submit("UPDATE ads", ("CR1",))
+        submitted.set()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            cancelled.append("consumer")
+
+    async def fake_monitor(con, interval):
+        try:
+            await asyncio.Event().wait()
+        finally:
+            cancelled.append("monitor")
+
+    async def failing_producer(queue, con, bq_client, args):
+        await submitted.wait()
+        raise ValueError("bad manifest row")
+
+    monkeypatch.setattr(pipeline, "checkout", fake_checkout)
+    monkeypatch.setattr(pipeline, "consumer", fake_consumer)
+    monkeypatch.setattr(pipeline, "monitor_summary", fake_monitor)
+    monkeypatch.setattr(pipeline, "producer", failing_producer)
+    args = SimpleNamespace(
+        project_id="p",
+        gcs_bucket="b",
+        bq_location="US",
+        sql_conn="c",
+        db_host=None,
+        db_port=None,
+        concurrency=1,
+        batch_size=1,
+    )
+
+    with pytest.raises(ValueError, match="bad manifest row"):
+        asyncio.run(pipeline.run(args, bq_client=object(), storage_client=object()))
+    assert writer_con.committed == [("UPDATE ads", ("CR1",))]
+    assert sorted(cancelled) == ["consumer", "monitor"]
@@ -1,6 +1,7 @@
+import hashlib
 from io import BytesIO
 
-from gatc_scraper.hashing import normalize_and_hash, stable_int_hash
+from gatc_scraper.hashing import normalize_and_hash, png_dimensions, stable_int_hash
 from PIL import Image
 
 
@@ -35,3 +36,39 @@ def test_stable_int_hash_is_deterministic():
     value = stable_int_hash("hello")
     assert value == stable_int_hash("hello")
     assert value != stable_int_hash("world")
+
+
+def test_normalize_and_hash_phash_matches_bitstring_reference():
+    img = Image.new("RGBA", (16, 16), (0, 0, 0, 255))
+    for x in range(16):
+        for y in range(16):
+            img.putpixel((x, y), ((x * 37 + y * 11) % 256, (x * y) % 256, (y * 53) % 256, 255))
+    buf = BytesIO()
+    img.save(buf, format="PNG")
+
+    _, _, phash, _, _ = normalize_and_hash(buf.getvalue(), trim=False)
+
+    ah = img.convert("L").resize((8, 8), resample=Image.Resampling.LANCZOS)
+    pixels = list(ah.getdata())
+    avg = sum(pixels) / len(pixels)
+    bits = "".join("1" if p > avg else "0" for p in pixels)
+    assert phash == f"{int(bits, 2):016x}"
+
+
+def test_normalize_and_hash_reuses_untrimmed_rgba_png_when_enabled(monkeypatch):
+    original = _png_bytes(border=0)
+    monkeypatch.setenv("GATC_REUSE_SOURCE_PNG", "1")
+    normalized, sha, _, width, height = normalize_and_hash(original)
+    assert normalized == original
+    assert sha == hashlib.sha256(original).hexdigest()
+    assert (width, height) == (10, 10)
+
+    trimmed, _, _, width, _ = normalize_and_hash(_png_bytes(border=2))
+    assert width == 6
+    assert trimmed != _png_bytes(border=2)
+
+
+def test_png_dimensions_reads_ihdr_without_decoding():
+    assert png_dimensions(_png_bytes(width=12, height=7)) == (12, 7)
+    assert png_dimensions(b"GIF89a" + b"\x00" * 32) is None
+    assert png_dimensions(b"") is None
@@ -0,0 +1,57 @@
+import hashlib
+
+import pytest
+from gatc_scraper.hashing import stable_int_hash
+from gatc_scraper.image.pipeline import build_image_ads_query, parse_args
+
+
+def test_year_only_start_date_expands_to_calendar_year():
+    args = parse_args(["--start-date", "2024", "--sql-limit", "10"])
+    assert args.start_date == "2024-01-01"
+    assert args.end_date == "2024-12-31"
+
+
+def test_year_only_start_date_keeps_explicit_end_date():
+    args = parse_args(["--start-date", "2024", "--end-date", "2024-06-30", "--sql-limit", "10"])
+    assert (args.start_date, args.end_date) == ("2024-01-01", "2024-06-30")
+
+
+def test_build_image_ads_query_uses_range_predicates():
+    sql = build_image_ads_query("2024-01-01", "2024-12-31", "date_desc", 50)
+    assert "EXTRACT(" not in sql
+    assert "date_range_start >= DATE '2024-01-01'" in sql
+    assert "date_range_start <= DATE '2024-12-31'" in sql
+    assert sql.endswith("LIMIT 50")
+
+
+def test_build_image_ads_query_pushes_shard_filter_into_sql():
+    assert "SHA1(Ad_ID)" not in build_image_ads_query(None, None, "none", None)
+    sql = build_image_ads_query(None, None, "none", None, shard=2, shard_count=4)
+    assert "MOD(CAST(CONCAT('0x', TO_HEX(SUBSTR(SHA1(Ad_ID), 1, 4))) AS INT64), 4) = 2" in sql
+
+
+def _bq_shard(ad_id: str, shard_count: int) -> int:
+    # Step-by-step mirror of the BigQuery expression: SHA1 -> SUBSTR(1, 4) -> TO_HEX -> CAST('0x..' AS INT64) -> MOD.
+    digest_prefix = hashlib.sha1(ad_id.encode("utf-8")).digest()[0:4]
+    return int("0x" + digest_prefix.hex(), 16) % shard_count
+
+
+@pytest.mark.parametrize("ad_id", ["CR00000000000000000001", "CR15468741397530624001", "CR99999999999999999999", "AR1"])
+def test_sql_shard_matches_stable_int_hash(ad_id):
+    for shard_count in (2, 3, 7):
+        assert _bq_shard(ad_id, shard_count) == stable_int_hash(ad_id) % shard_count
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--start-date", "20240101"],
+        ["--end-date", "2024-02-30"],
+        ["--since-days", "-1"],
+        ["--shard", "3", "--shard-count", "3"],
+        ["--concurrency", "0"],
+    ],
+)
+def test_parse_args_rejects_invalid_values(argv):
+    with pytest.raises(ValueError):
+        parse_args([*argv, "--sql-limit", "10"])
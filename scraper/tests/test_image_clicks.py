@@ -0,0 +1,46 @@
+import asyncio
+import json
+
+from gatc_scraper.image.pipeline import _FLETCH_CLICK_PROBE_JS, extract_click_urls_from_fletch
+
+
+class _FakeFrame:
+    def __init__(self, probe: dict, scripts: str = "") -> None:
+        self.probe = probe
+        self.scripts = scripts
+        self.calls = 0
+
+    async def evaluate(self, script: str, *args):
+        self.calls += 1
+        return self.probe if script == _FLETCH_CLICK_PROBE_JS else self.scripts
+
+
+def test_fletch_anchor_first_unwraps_redirector_in_one_round_trip():
+    frame = _FakeFrame(
+        {
+            "anchors": [
+                "https://www.googleadservices.com/pagead/aclk?sa=L&adurl=https://example.org/donate",
+                "https://tpc.googlesyndication.com/simgad/123",
+            ],
+            "adData": {"destination_url": "https://ignored.example.com"},
+            "metaPayloads": [],
+        }
+    )
+    assert asyncio.run(extract_click_urls_from_fletch(frame)) == ["https://example.org/donate"]
+    assert frame.calls == 1
+
+
+def test_fletch_meta_payload_fallback_dedupes_urls():
+    meta = json.dumps({"a": "https://example.org/x", "b": ["https://example.org/x", "see https://example.net/y"]})
+    frame = _FakeFrame({"anchors": [], "adData": None, "metaPayloads": [meta]})
+    assert asyncio.run(extract_click_urls_from_fletch(frame)) == ["https://example.org/x", "https://example.net/y"]
+    assert frame.calls == 1
+
+
+def test_fletch_script_fallback_prefers_redirector_targets():
+    scripts = (
+        'var lib = "https://www.gstatic.com/lib.js";\n'
+        'var c = "https://www.googleadservices.com/pagead/aclk?sa=L&adurl=https://example.org/landing";'
+    )
+    frame = _FakeFrame({"anchors": [], "adData": None, "metaPayloads": []}, scripts=scripts)
+    assert asyncio.run(extract_click_urls_from_fletch(frame)) == ["https://example.org/landing"]
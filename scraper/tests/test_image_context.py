@@ -0,0 +1,216 @@
+import asyncio
+import io
+
+import pytest
+from gatc_scraper.image import pipeline
+from gatc_scraper.image.pipeline import _WarmContext
+from PIL import Image
+
+
+class _FakeFrame:
+    def __init__(self, url: str) -> None:
+        self.url = url
+
+
+class _FakePage:
+    def __init__(self, context: "_FakeContext") -> None:
+        self.context = context
+        self.frames: list[_FakeFrame] = []
+        self.handlers: dict = {}
+
+    def on(self, event: str, handler) -> None:
+        self.handlers[event] = handler
+
+    def navigate(self, url: str) -> None:
+        frame = _FakeFrame(url)
+        self.frames.append(frame)
+        self.handlers["framenavigated"](frame)
+
+    async def close(self) -> None:
+        self.context.pages.remove(self)
+
+
+class _FakeCdpSession:
+    def __init__(self, context: "_FakeContext") -> None:
+        self.context = context
+
+    async def send(self, method: str, params: dict) -> None:
+        self.context.cdp_calls.append((method, params))
+
+    async def detach(self) -> None:
+        pass
+
+
+class _FakeContext:
+    def __init__(self) -> None:
+        self.pages: list = []
+        self.cdp_calls: list = []
+        self.cookies_cleared = 0
+        self.closed = False
+        self.handlers: dict = {}
+
+    def on(self, event: str, handler) -> None:
+        self.handlers[event] = handler
+
+    async def new_page(self) -> _FakePage:
+        page = _FakePage(self)
+        self.pages.append(page)
+        if "page" in self.handlers:
+            self.handlers["page"](page)
+        return page
+
+    async def new_cdp_session(self, page: _FakePage) -> _FakeCdpSession:
+        assert page in self.pages
+        return _FakeCdpSession(self)
+
+    async def clear_cookies(self) -> None:
+        self.cookies_cleared += 1
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class _FakeBrowser:
+    def __init__(self) -> None:
+        self.created: list[_FakeContext] = []
+
+    async def new_context(self, **kwargs):
+        ctx = _FakeContext()
+        self.created.append(ctx)
+        return ctx
+
+
+def test_warm_context_is_reset_and_reused_until_recycled(monkeypatch):
+    monkeypatch.setattr(pipeline, "CONTEXT_REUSE_MAX_ADS", 2)
+    browser, other = _FakeBrowser(), _FakeBrowser()
+    warm = _WarmContext()
+
+    async def scenario():
+        def clear(origin):
+            return ("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+
+        first = await warm.acquire(browser, user_agent="ua", device_scale_factor=1)
+        page = await first.new_page()
+        page.navigate(f"{pipeline.GATC_ORIGIN}/advertiser/AR1/creative/CR1")
+        # A variant page closed before release still has its creative origins cleared.
+        variant = await first.new_page()
+        variant.navigate("https://tpc.googlesyndication.com/archive/sadbundle/1/index.html")
+        variant.navigate("https://cdn.advertiser.example/banner.html?x=1")
+        await variant.close()
+        # Frames still open at release are swept too.
+        page.frames.append(_FakeFrame("https://googleads.g.doubleclick.net/pagead/ads"))
+        await warm.release()
+        assert first.cdp_calls == [
+            clear(pipeline.GATC_ORIGIN),
+            clear("https://cdn.advertiser.example"),
+            clear("https://googleads.g.doubleclick.net"),
+            clear("https://tpc.googlesyndication.com"),
+        ]
+        # Origins do not carry over: the next ad only clears what it visited.
+        first.cdp_calls.clear()
+        assert await warm.acquire(browser, user_agent="ua", device_scale_factor=1) is first
+        await warm.release()
+        assert first.cdp_calls == [clear(pipeline.GATC_ORIGIN)]
+        assert first.cookies_cleared == 2 and not first.closed
+        assert first.pages == []
+        # Reuse limit reached: the next ad gets a fresh context.
+        second = await warm.acquire(browser, user_agent="ua", device_scale_factor=1)
+        assert second is not first and first.closed
+        # A relaunched browser never receives a context from the old one.
+        third = await warm.acquire(other, user_agent="ua", device_scale_factor=1)
+        assert third is other.created[0] and second.closed
+
+    asyncio.run(scenario())
+
+
+def test_warm_context_is_discarded_when_storage_cannot_be_cleared():
+    class _NoCdpContext(_FakeContext):
+        async def new_cdp_session(self, page):
+            raise RuntimeError("cdp unavailable")
+
+    class _NoCdpBrowser(_FakeBrowser):
+        async def new_context(self, **kwargs):
+            ctx = _NoCdpContext()
+            self.created.append(ctx)
+            return ctx
+
+    warm = _WarmContext()
+
+    async def scenario():
+        ctx = await warm.acquire(_NoCdpBrowser(), user_agent="ua", device_scale_factor=1)
+        await warm.release()
+        assert ctx.closed and warm.context is None
+
+    asyncio.run(scenario())
+
+
+class _FakeResponse:
+    def __init__(self, content_type: str, content: bytes = b"image-bytes") -> None:
+        self.headers = {"Content-Type": content_type}
+        self.content = content
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+class _FakeHttp:
+    def __init__(self, content_type: str, content: bytes = b"image-bytes") -> None:
+        self.content_type = content_type
+        self.content = content
+
+    def get(self, url: str, timeout: int) -> _FakeResponse:
+        return _FakeResponse(self.content_type, self.content)
+
+
+def _capture_image_src_variant(context, http):
+    return pipeline._capture_iframe_variant(
+        context,
+        con=None,
+        storage_client=None,
+        bucket_name="bucket",
+        http=http,
+        args=None,
+        t=pipeline.Timeouts(page_ms=1, iframe_ms=1),
+        ad_id="CR1",
+        ad_url="https://adstransparency.google.com/advertiser/AR1/creative/CR1",
+        adv="AR1",
+        variant_id="v1",
+        src_abs="https://tpc.googlesyndication.com/simgad/123/banner.PNG?w=300",
+        dry_run=True,
+    )
+
+
+class _NoPageContext:
+    async def new_page(self):
+        raise AssertionError("image srcs must not open a page")
+
+
+def test_iframe_variant_pointing_at_an_image_skips_the_page(monkeypatch):
+    stored = []
+
+    async def fake_finalize(*args, **kwargs):
+        stored.append((args[6], kwargs["capture_target"]))
+        return True
+
+    monkeypatch.setattr(pipeline, "_finalize_capture", fake_finalize)
+    captured = asyncio.run(_capture_image_src_variant(_NoPageContext(), _FakeHttp("image/png")))
+    assert captured is True
+    assert stored == [(b"image-bytes", "iframe_src_img")]
+
+
+class _Rendered(Exception):
+    pass
+
+
+class _RenderingContext:
+    async def new_page(self):
+        raise _Rendered
+
+
+def test_too_small_image_src_falls_through_to_rendering(monkeypatch):
+    monkeypatch.setattr(pipeline, "MIN_ASSET_DIM_PX", 50)
+    buf = io.BytesIO()
+    Image.new("RGB", (1, 1)).save(buf, format="PNG")
+    # The 1x1 tracking pixel is not stored; the variant is rendered on a page instead.
+    with pytest.raises(_Rendered):
+        asyncio.run(_capture_image_src_variant(_RenderingContext(), _FakeHttp("image/png", buf.getvalue())))
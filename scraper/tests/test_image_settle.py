@@ -0,0 +1,86 @@
+import asyncio
+import random
+from io import BytesIO
+
+from gatc_scraper.image.pipeline import _ahash64, _quiescent_or_settled_screenshot, _settle_screenshot_hashed
+from PIL import Image
+
+
+def _noise_png(seed: int, size: int = 32) -> bytes:
+    rng = random.Random(seed)
+    img = Image.new("RGB", (size, size))
+    img.putdata([(rng.randrange(256), rng.randrange(256), rng.randrange(256)) for _ in range(size * size)])
+    buf = BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _reference_ahash64(png_bytes: bytes) -> int:
+    with Image.open(BytesIO(png_bytes)) as im:
+        pixels = list(im.convert("L").resize((8, 8)).getdata())
+    avg = sum(pixels) / 64.0
+    return sum(1 << i for i, p in enumerate(pixels) if p >= avg)
+
+
+def test_ahash64_matches_per_pixel_reference():
+    for seed in range(5):
+        png = _noise_png(seed)
+        assert _ahash64(png) == _reference_ahash64(png)
+
+
+def test_ahash64_returns_sentinel_for_undecodable_bytes():
+    assert _ahash64(b"not a png") == -1
+
+
+def test_settle_screenshot_hashed_returns_hash_of_returned_frame():
+    frames = [_noise_png(1), _noise_png(2)]
+
+    async def grab() -> bytes:
+        return frames[0] if len(frames) == 1 else frames.pop(0)
+
+    png, ahash = asyncio.run(_settle_screenshot_hashed(grab, max_wait_ms=60, min_stable_ms=0, interval_ms=5, min_observe_ms=0))
+    assert png == frames[0]
+    assert ahash == _ahash64(png)
+
+
+def test_settle_screenshot_fast_exits_on_static_frames():
+    png = _noise_png(3)
+    calls = 0
+
+    async def grab() -> bytes:
+        nonlocal calls
+        calls += 1
+        return png
+
+    settled, _ = asyncio.run(_settle_screenshot_hashed(grab, max_wait_ms=5000, min_stable_ms=20, interval_ms=5, min_observe_ms=0))
+    assert settled == png
+    assert calls < 100  # returned after ~3 stable windows, not after sampling for max_wait_ms
+
+
+class _FakePage:
+    def __init__(self, quiescent: bool) -> None:
+        self.quiescent = quiescent
+
+    async def wait_for_function(self, script: str, timeout: int) -> None:
+        if not self.quiescent:
+            raise TimeoutError("still animating")
+
+
+def test_quiescent_page_takes_a_single_screenshot():
+    png = _noise_png(4)
+    calls = 0
+
+    async def grab() -> bytes:
+        nonlocal calls
+        calls += 1
+        return png
+
+    for quiescent, expect_single in ((True, True), (False, False)):
+        calls = 0
+        settled = asyncio.run(
+            _quiescent_or_settled_screenshot(
+                _FakePage(quiescent), grab, quiescent_timeout_ms=10, max_wait_ms=200, min_stable_ms=20, interval_ms=5, min_observe_ms=0
+            )
+        )
+        assert settled == png
+        assert (calls == 1) is expect_single